@@ -0,0 +1,5 @@
+"""
+Benchmarks for the :py:func:`pydocstring.generate_docstring` hot path
+
+Run with ``python -m benchmarks``, see ``python -m benchmarks --help`` for options.
+"""
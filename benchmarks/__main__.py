@@ -0,0 +1,66 @@
+"""
+Command line entrypoint for the benchmarks
+
+.. code-block:: text
+
+    usage: python -m benchmarks [-h] [--sizes SIZES [SIZES ...]]
+                                [--formatters {google,numpy,reST} [...]]
+                                [--repeat REPEAT] [--output OUTPUT]
+                                [--compare BASELINE]
+"""
+
+import argparse
+import sys
+
+from benchmarks import runner
+
+
+def format_result(result):
+    return "{lines:>7} lines {position:<6} autocomplete={autocomplete!s:<5} {formatter:<6} " \
+        "p50={p50:.4f}s p95={p95:.4f}s p99={p99:.4f}s peak={peak_memory:,}B".format(**result)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=list(runner.SIZES),
+        help="module sizes in lines",
+    )
+    parser.add_argument(
+        "--formatters",
+        nargs="+",
+        choices=runner.FORMATTERS,
+        default=list(runner.FORMATTERS),
+        help="formatters to benchmark",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per case")
+    parser.add_argument("--output", help="save the results as JSON to this path")
+    parser.add_argument(
+        "--compare", metavar="BASELINE", help="JSON results of an earlier run to compare with"
+    )
+    args = parser.parse_args(argv)
+
+    def progress(result):
+        print(format_result(result))
+        sys.stdout.flush()
+
+    results = runner.run(
+        sizes=args.sizes, formatters=args.formatters, repeat=args.repeat, progress=progress
+    )
+    if args.output:
+        runner.save(results, args.output)
+    if args.compare:
+        print("\nCompared with {0} (ratio > 1 is slower / larger):".format(args.compare))
+        for case, latency, memory in runner.compare(runner.load(args.compare), results):
+            print(
+                "{0:>7} lines {1:<6} autocomplete={2!s:<5} {3:<6} p50 x{4:.2f} peak x{5:.2f}".format(
+                    *(case + (latency, memory))
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Time :py:func:`pydocstring.generate_docstring` over synthetic modules
+"""
+
+import datetime
+import gc
+import json
+import platform
+import time
+import tracemalloc
+
+import parso
+
+import pydocstring
+from benchmarks.synthetic import POSITIONS, cursor_case, generate_module
+
+SIZES = (100, 1000, 10000, 100000)
+FORMATTERS = ("google", "numpy", "reST")
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(samples, percent):
+    """
+    Nearest rank percentile of a list of samples
+
+    Args:
+        samples (list): the samples, need not be sorted
+        percent (int): the percentile, from 0 to 100
+
+    Returns:
+        float: the sample at that percentile
+    """
+    ordered = sorted(samples)
+    rank = max(int(round(percent / 100.0 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def measure(source, position, formatter, autocomplete, repeat):
+    """
+    Time repeated calls to generate_docstring, then measure peak memory of one more call
+
+    Returns:
+        dict: latency percentiles in seconds, and peak memory in bytes
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pydocstring.generate_docstring(
+            source, position=position, formatter=formatter, autocomplete=autocomplete
+        )
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        pydocstring.generate_docstring(
+            source, position=position, formatter=formatter, autocomplete=autocomplete
+        )
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = {"p{0}".format(p): percentile(timings, p) for p in PERCENTILES}
+    result["peak_memory"] = peak_memory
+    return result
+
+
+def run(sizes=SIZES, formatters=FORMATTERS, repeat=5, progress=None):
+    """
+    Run every benchmark case
+
+    Args:
+        sizes (tuple): module sizes, in lines
+        formatters (tuple): formatter names
+        repeat (int): timed calls per case
+        progress (callable): called with each result as it is measured
+
+    Returns:
+        dict: run metadata and a list of results, ready to be saved as JSON
+    """
+    results = []
+    for lines in sizes:
+        module, def_rows = generate_module(lines)
+        for position in POSITIONS:
+            for autocomplete in (False, True):
+                source, cursor = cursor_case(module, def_rows, position, autocomplete)
+                for formatter in formatters:
+                    result = {
+                        "lines": lines,
+                        "position": position,
+                        "autocomplete": autocomplete,
+                        "formatter": formatter,
+                    }
+                    result.update(measure(source, cursor, formatter, autocomplete, repeat))
+                    results.append(result)
+                    if progress:
+                        progress(result)
+    return {
+        "meta": {
+            "pydocstring": pydocstring.__version__,
+            "parso": parso.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "repeat": repeat,
+            "date": datetime.datetime.now().isoformat(),
+        },
+        "results": results,
+    }
+
+
+def case_key(result):
+    """
+    Identify the case a result is for, to match results across runs
+    """
+    return (result["lines"], result["position"], result["autocomplete"], result["formatter"])
+
+
+def compare(baseline, current):
+    """
+    Compare the p50 latency and peak memory of two runs
+
+    Args:
+        baseline (dict): an earlier run
+        current (dict): the run to compare with it
+
+    Returns:
+        list: ``(case, p50 ratio, peak memory ratio)`` for each case in both runs, a ratio above
+        1 means the current run is slower or uses more memory
+    """
+    earlier = {case_key(result): result for result in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        before = earlier.get(case_key(result))
+        if before is None:
+            continue
+        comparison.append(
+            (
+                case_key(result),
+                result["p50"] / before["p50"] if before["p50"] else float("inf"),
+                result["peak_memory"] / float(before["peak_memory"] or 1),
+            )
+        )
+    return comparison
+
+
+def save(run_result, path):
+    with open(path, "w") as results_file:
+        json.dump(run_result, results_file, indent=2)
+
+
+def load(path):
+    with open(path) as results_file:
+        return json.load(results_file)
@@ -0,0 +1,75 @@
+"""
+Synthetic python modules of a given size to benchmark against
+"""
+
+FUNCTION_TEMPLATE = '''\
+def function_{0}(p1, p2: int, p3=3, *args, p4={{'a': 'b'}}, **kwargs) -> int:
+    if p1:
+        raise ValueError(p1)
+    for item in args:
+        yield item
+    return p2 + p3
+
+'''
+
+CLASS_TEMPLATE = '''\
+class Class{0}(object):
+    attribute = [1, 2, 3]
+    other = None
+
+    def method(self, p1, p2=None):
+        return p1
+
+'''
+
+CONSTANT_TEMPLATE = "CONSTANT_{0} = {0}\n"
+
+# cursor positions, as a fraction of the way through the module
+POSITIONS = {"start": 0.0, "middle": 0.5, "end": 1.0}
+
+
+def generate_module(lines):
+    """
+    Build a module of roughly the given number of lines, from functions, classes and constants
+
+    Args:
+        lines (int): number of lines to generate, at least 10
+
+    Returns:
+        tuple: the source, and a list of the row of each ``def`` line in it
+    """
+    parts = []
+    def_rows = []
+    row = 1
+    index = 0
+    while row < lines:
+        for template in (FUNCTION_TEMPLATE, CLASS_TEMPLATE, CONSTANT_TEMPLATE):
+            if template is FUNCTION_TEMPLATE:
+                def_rows.append(row)
+            part = template.format(index)
+            parts.append(part)
+            row += part.count("\n")
+        index += 1
+    return "".join(parts), def_rows
+
+
+def cursor_case(source, def_rows, position, autocomplete):
+    """
+    Place the cursor in the function nearest the given position
+
+    Args:
+        source (str): module source from :py:func:`generate_module`
+        def_rows (list): rows of the ``def`` lines in the source
+        position (str): ``start``, ``middle`` or ``end``
+        autocomplete (bool): if True, ``\"\"\"`` is typed on a new line under the ``def``
+            and the cursor placed after it
+
+    Returns:
+        tuple: the source and cursor position to call ``generate_docstring`` with
+    """
+    row = def_rows[int(round(POSITIONS[position] * (len(def_rows) - 1)))]
+    if not autocomplete:
+        return source, (row, 4)
+    lines = source.splitlines(True)
+    lines.insert(row, '    """\n')
+    return "".join(lines), (row + 1, 7)
@@ -5,12 +5,72 @@ Top level API - all you need to integrate with an editor, just call
 
 __version__ = "0.2.1"
 
-import parso
-from parso.python.tree import BaseNode, search_ancestor
+import importlib
+import sys
 
-import pydocstring.formatter
 from pydocstring import exc
 
+# name -> module of the public API re-exported here, the internals are imported from their own
+# modules. They are only imported when first used, so that e.g. ``pydocstring --version``
+# doesn't pay for importing parso
+_LAZY_IMPORTS = {
+    "AsyncDocstringGenerator": "pydocstring.aio",
+    "async_generate_docstring": "pydocstring.aio",
+    "Formatter": "pydocstring.formatter",
+    "get_formatter": "pydocstring.formatter",
+    "register_formatter": "pydocstring.formatter",
+    "ParseCache": "pydocstring.cache",
+    "DiskCache": "pydocstring.diskcache",
+    "ScopeInfo": "pydocstring.ir",
+    "ScopeFilter": "pydocstring.scopes",
+    "DocstringSession": "pydocstring.session",
+    "Timing": "pydocstring.timing",
+}
+
+# submodules available as attributes, imported when first used like the names above
+_LAZY_SUBMODULES = frozenset(
+    (
+        "aio",
+        "autocomplete",
+        "backends",
+        "batch",
+        "cache",
+        "cli",
+        "diskcache",
+        "format_utils",
+        "formatter",
+        "ir",
+        "lsp",
+        "rewrite",
+        "scopes",
+        "server",
+        "session",
+        "timing",
+        "window",
+    )
+)
+
+# Files larger than this (in characters) are parsed through a window by generate_docstring, see
+# pydocstring.window
+WINDOW_THRESHOLD = 256 * 1024
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(__name__ + "." + name)
+    try:
+        module = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS) | _LAZY_SUBMODULES)
+
+
 FORMATTER = {
     "google": {
         "start_args_block": "\n\nArgs:\n",
@@ -59,65 +119,259 @@ FORMATTER = {
     },
 }
 
+if sys.version_info < (3, 7):  # pragma: no cover
+    # no module __getattr__ (PEP 562), import everything up front
+    for _name in _LAZY_IMPORTS:
+        __getattr__(_name)
+    del _name
+
 
-def generate_docstring(source, position=(1, 0), formatter="google", autocomplete=False):
+def generate_docstring(
+    source,
+    position=(1, 0),
+    formatter="google",
+    autocomplete=False,
+    buffer_id=None,
+    cache=None,
+    on_timing=None,
+    window_threshold=WINDOW_THRESHOLD,
+    disk_cache=None,
+):
     """Generate a docstring
 
     Args:
         source (str): the text of the source
         position (tuple): the position of the cursor in the source, row, column. Rows start at 1
             Columns start at 0
-        formatter (str): the format of the docstring choose from google, numpy, reST.
+        formatter (str or Formatter): the format of the docstring choose from google, numpy, reST,
+            or a style registered with :py:func:`pydocstring.register_formatter`.
         autocomplete (bool): Whether or not to remove three characters from before the position prior
             to parsing the code. THis is to remove the \"\"\" before a docstring default: False
+        buffer_id (hashable): Opt in to parse caching by identifying the editor buffer the source
+            comes from. Subsequent calls for the same buffer only re-parse what changed.
+            default: None
+        cache (ParseCache): The cache to use with `buffer_id`, defaults to a shared module level
+            cache
+        on_timing (callable): Called with a :py:class:`pydocstring.timing.Timing` of how long
+            each phase took, once the docstring has been generated. default: None
+        window_threshold (int): Sources longer than this, without a `buffer_id`, are parsed only
+            around the top level ``def`` or ``class`` the cursor is in, see
+            :py:mod:`pydocstring.window`. None to always parse the whole source.
+            default: ``WINDOW_THRESHOLD``
+        disk_cache (DiskCache): Persistent cache to look the docstring up in before parsing,
+            and to store it in afterwards. `on_timing` isn't called when it's found there.
+            default: None
 
     Raises:
-        exc.InvalidFormatter: If the value provided to `formatter` is not a supported
+        exc.InvalidFormatterError: If the value provided to `formatter` is not a supported
             formatter name
 
     Returns:
        str or None: docstring, excluding quotation marks, or None, if one could not be generated
     """
-    if autocomplete:
-        lines = source.splitlines(True)
-        # all full lines before the one the position is on
-        lines_before = lines[: position[0] - 1]
-        # position in buffer is length of all those lines + the column position (starting at 0)
-        bufferpos = sum(len(l) for l in lines_before) + position[1]
-        # Splice the desired bits of the source together
-        slice1 = source[: bufferpos - 3]
-        slice2 = source[bufferpos:]
-        source = slice1 + slice2
-        # Shift the position to account for the removed quotes
-        position = (position[0], position[1] - 3)
+    from pydocstring.formatter import get_formatter
+    from pydocstring.scopes import format_scope
+    from pydocstring.timing import Timing, get_clock
 
-    tree = parso.parse(source)
-    assert isinstance(tree, BaseNode)
-    try:
-        leaf = tree.get_leaf_for_position(position, include_prefixes=True)
-    except ValueError as e:
-        leaf = tree
-    if not leaf:  # pragma: no cover
-        raise exc.FailedToGenerateDocstringError(
-            "Could not find leaf at cursor position {}".format(position)
-        )
-    scopes = ("classdef", "funcdef", "file_input")
-    scope = search_ancestor(leaf, *scopes)
-    if not scope:
-        if leaf.type == "file_input":
-            scope = leaf
-        else:  # pragma: no cover
-            raise exc.FailedToGenerateDocstringError(
-                "Could not find scope of leaf {} ".format(leaf)
+    formatter = get_formatter(formatter)
+    if disk_cache is not None:
+        key = disk_cache.key(formatter.fingerprint, source, list(position), autocomplete)
+        docstring = disk_cache.get(key)
+        if docstring is not None:
+            return docstring
+    clock = get_clock(on_timing)
+    start = clock()
+    scope, source, spliced, parsed = _locate_scope(
+        source, position, autocomplete, buffer_id, cache, window_threshold, clock
+    )
+    found = clock()
+    docstring = format_scope(scope, formatter)
+    if disk_cache is not None:
+        disk_cache.set(key, docstring)
+
+    if on_timing is not None:
+        on_timing(
+            Timing(
+                splice=spliced - start,
+                parse=parsed - spliced,
+                scope=found - parsed,
+                format=clock() - found,
+                source_size=len(source),
+                scope_type=scope.type,
             )
+        )
+    return docstring
+
+
+def generate_docstring_styles(
+    source,
+    position=(1, 0),
+    formatters=("google", "numpy", "reST"),
+    autocomplete=False,
+    buffer_id=None,
+    cache=None,
+    window_threshold=WINDOW_THRESHOLD,
+):
+    """Generate the docstring for one scope in several styles
+
+    The source is parsed and the scope is read once, then rendered in each style, rather than
+    calling :py:func:`generate_docstring` once per style.
+
+    Args:
+        source (str): the text of the source
+        position (tuple): the position of the cursor in the source, row, column. Rows start at 1
+            Columns start at 0
+        formatters (list): the styles to render, names of registered styles or
+            :py:class:`pydocstring.formatter.Formatter` objects. default: google, numpy and reST
+        autocomplete (bool): Whether or not to remove three characters from before the position
+            prior to parsing the code, as :py:func:`generate_docstring`. default: False
+        buffer_id (hashable): Opt in to parse caching, as :py:func:`generate_docstring`.
+            default: None
+        cache (ParseCache): The cache to use with `buffer_id`, defaults to a shared module level
+            cache
+        window_threshold (int): Sources longer than this, without a `buffer_id`, are parsed only
+            around the top level ``def`` or ``class`` the cursor is in. default:
+            ``WINDOW_THRESHOLD``
+
+    Raises:
+        exc.InvalidFormatterError: If a value in `formatters` is not a supported formatter name
+
+    Returns:
+        dict: the docstring, excluding quotation marks, keyed by the name of each style, in the
+        order of `formatters`
+    """
+    from pydocstring.formatter import get_formatter
+    from pydocstring.ir import extract_scope
+    from pydocstring.scopes import format_scope
+    from pydocstring.timing import no_clock
+
+    formatters = [get_formatter(formatter) for formatter in formatters]
+    scope = _locate_scope(
+        source, position, autocomplete, buffer_id, cache, window_threshold, no_clock
+    )[0]
+    scope = extract_scope(scope)
+    return {formatter.name: format_scope(scope, formatter) for formatter in formatters}
+
+
+def generate_all_docstrings(source, formatter="google", scope_filter=None):
+    """Generate docstrings for the module and every class and function in the source
 
-    if scope.type == "classdef":
-        return pydocstring.formatter.class_docstring(scope, FORMATTER[formatter])
-    elif scope.type == "funcdef":
-        return pydocstring.formatter.function_docstring(scope, FORMATTER[formatter])
-    elif scope.type == "file_input":
-        return pydocstring.formatter.module_docstring(scope, FORMATTER[formatter])
+    The source is parsed once and the tree is walked once, rather than calling
+    :py:func:`generate_docstring` for each scope. Source that compiles is parsed with
+    :py:mod:`ast`, which is faster than parso, see :py:mod:`pydocstring.backends`.
 
-    raise exc.FailedToGenerateDocstringError(
-        "Failed to generate Docstring for: {}".format(scope)
-    )  # pragma: no cover
+    Args:
+        source (str): the text of the source
+        formatter (str or Formatter): the format of the docstring choose from google, numpy,
+            reST, or a style registered with :py:func:`pydocstring.register_formatter`.
+        scope_filter (ScopeFilter): only generate docstrings for the scopes that pass this
+            :py:class:`pydocstring.scopes.ScopeFilter`, e.g. those without one. default: None
+
+    Raises:
+        exc.InvalidFormatterError: If the value provided to `formatter` is not a supported
+            formatter name
+
+    Returns:
+        list: a :py:class:`pydocstring.scopes.ScopeDocstring` for each scope, in source order
+    """
+    from pydocstring.backends import iter_source_scopes
+    from pydocstring.formatter import get_formatter
+    from pydocstring.scopes import scope_docstring
+
+    formatter = get_formatter(formatter)
+    return [
+        scope_docstring(scope, formatter)
+        for scope in iter_source_scopes(source, scope_filter=scope_filter)
+    ]
+
+
+def generate_docstrings(source, positions, formatter="google"):
+    """Generate docstrings for many cursor positions in the same source
+
+    The source is parsed once and the scope of every position is found from one index of the
+    tree. Positions in the same scope share one rendered docstring.
+
+    Args:
+        source (str): the text of the source
+        positions (list): the positions to generate docstrings for, each a row, column tuple.
+            Rows start at 1, columns start at 0
+        formatter (str or Formatter): the format of the docstring choose from google, numpy,
+            reST, or a style registered with :py:func:`pydocstring.register_formatter`.
+
+    Raises:
+        exc.InvalidFormatterError: If the value provided to `formatter` is not a supported
+            formatter name
+
+    Returns:
+        list: the docstring for each position, in the order of `positions`
+    """
+    import parso
+
+    from pydocstring.formatter import get_formatter
+    from pydocstring.scopes import ScopeIndex, format_scope
+
+    formatter = get_formatter(formatter)
+    tree = parso.parse(source)
+    rendered = {}
+    docstrings = []
+    for scope in ScopeIndex(tree).find_all(positions):
+        if scope not in rendered:
+            rendered[scope] = format_scope(scope, formatter)
+        docstrings.append(rendered[scope])
+    return docstrings
+
+
+def _locate_scope(source, position, autocomplete, buffer_id, cache, window_threshold, clock):
+    """
+    Parse the source and find the scope at the position, the way :py:func:`generate_docstring`
+    does
+
+    Returns:
+        tuple: the scope node, or its :py:class:`pydocstring.ir.ScopeInfo` when it's read from
+        a cached module, the source with the quotes removed, and the clock readings once
+        the quotes were removed and once the source was parsed
+    """
+    import parso
+    from parso.python.tree import BaseNode
+    from parso.utils import split_lines
+
+    from pydocstring.autocomplete import remove_quotes, remove_quotes_from_lines
+    from pydocstring.cache import BUFFER_CACHE
+    from pydocstring.ir import extract_scope
+    from pydocstring.scopes import find_scope
+    from pydocstring.window import find_window
+
+    if buffer_id is not None:
+        # the quote removal is an edit of one line, that the cache re-parses incrementally
+        lines = split_lines(source, keepends=True)
+        if autocomplete:
+            position = remove_quotes_from_lines(lines, position)
+        spliced = clock()
+        cache = cache if cache is not None else BUFFER_CACHE
+        # another thread parsing the same buffer updates the module in place, so read the scope
+        # out of it before letting go of the cache
+        with cache.lock:
+            tree = cache.parse_lines(lines, buffer_id, source)
+            parsed = clock()
+            scope = extract_scope(cache.find_scope(buffer_id, tree, position))
+    else:
+        scope = None
+        if window_threshold is not None and len(source) > window_threshold:
+            window = find_window(source, position, autocomplete)
+            if window is not None:
+                spliced = clock()
+                tree = parso.parse(window[0])
+                parsed = clock()
+                scope = find_scope(tree, window[1])
+                if scope.type == "file_input":
+                    # the module docstring needs the whole module
+                    scope = None
+        if scope is None:
+            if autocomplete:
+                source, position = remove_quotes(source, position)
+            spliced = clock()
+            tree = parso.parse(source)
+            parsed = clock()
+            scope = find_scope(tree, position)
+    assert isinstance(tree, BaseNode)
+    return scope, source, spliced, parsed
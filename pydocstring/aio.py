@@ -0,0 +1,127 @@
+"""
+asyncio API, for editor integrations built on an event loop
+
+Parsing runs in a small thread pool so it doesn't block the loop. Requests for the same buffer are
+"latest wins": a request that is still waiting for a worker when a newer one for the same buffer
+arrives is cancelled, so under fast typing the workers only parse the buffer as it is now.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pydocstring
+from pydocstring.cache import ParseCache
+
+# returned by a worker for a request superseded before it started
+_SUPERSEDED = object()
+
+
+class AsyncDocstringGenerator(object):
+    """
+    Generates docstrings in a bounded pool of worker threads
+
+    Args:
+        max_workers (int): number of worker threads. default: ``1``
+        cache (ParseCache): cache of parsed buffers, a new one is made if not given
+    """
+
+    def __init__(self, max_workers=1, cache=None):
+        self.cache = cache if cache is not None else ParseCache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # buffer_id -> token of the newest request for the buffer
+        self._latest = {}
+        # buffer_id -> future of the newest request for the buffer
+        self._pending = {}
+
+    async def generate_docstring(
+        self, source, position=(1, 0), formatter="google", autocomplete=False, buffer_id=None
+    ):
+        """
+        Generate a docstring without blocking the event loop
+
+        Takes the same arguments as :py:func:`pydocstring.generate_docstring`. Requests with a
+        `buffer_id` are parsed incrementally, and supersede earlier requests for the same buffer.
+
+        Raises:
+            asyncio.CancelledError: If a newer request for the same buffer arrived before this
+                one was parsed
+            exc.InvalidFormatterError: If the value provided to `formatter` is not a supported
+                formatter name
+
+        Returns:
+            str: docstring, excluding quotation marks
+        """
+        loop = asyncio.get_event_loop()
+        if buffer_id is None:
+            return await loop.run_in_executor(
+                self._executor,
+                partial(
+                    pydocstring.generate_docstring,
+                    source,
+                    position=position,
+                    formatter=formatter,
+                    autocomplete=autocomplete,
+                ),
+            )
+
+        token = object()
+        self._latest[buffer_id] = token
+        previous = self._pending.get(buffer_id)
+        if previous is not None:
+            # only succeeds if it hasn't started, else _generate returns its result as usual
+            previous.cancel()
+        future = self._executor.submit(
+            self._generate, token, source, position, formatter, autocomplete, buffer_id
+        )
+        self._pending[buffer_id] = future
+        try:
+            result = await asyncio.wrap_future(future)
+        finally:
+            if self._pending.get(buffer_id) is future:
+                del self._pending[buffer_id]
+                del self._latest[buffer_id]
+        if result is _SUPERSEDED:
+            raise asyncio.CancelledError()
+        return result
+
+    def close(self):
+        """
+        Shut down the worker threads, once they have finished their current requests
+        """
+        self._executor.shutdown(wait=True)
+
+    def _generate(self, token, source, position, formatter, autocomplete, buffer_id):
+        if self._latest.get(buffer_id) is not token:
+            return _SUPERSEDED
+        return pydocstring.generate_docstring(
+            source,
+            position=position,
+            formatter=formatter,
+            autocomplete=autocomplete,
+            buffer_id=buffer_id,
+            cache=self.cache,
+        )
+
+
+_GENERATOR = None
+
+
+async def async_generate_docstring(
+    source, position=(1, 0), formatter="google", autocomplete=False, buffer_id=None
+):
+    """
+    Generate a docstring without blocking the event loop, using a shared single worker
+
+    See :py:meth:`AsyncDocstringGenerator.generate_docstring`.
+    """
+    global _GENERATOR
+    if _GENERATOR is None:
+        _GENERATOR = AsyncDocstringGenerator()
+    return await _GENERATOR.generate_docstring(
+        source,
+        position=position,
+        formatter=formatter,
+        autocomplete=autocomplete,
+        buffer_id=buffer_id,
+    )
@@ -0,0 +1,70 @@
+"""
+Removing the quotes typed before the cursor, when a docstring is generated as autocompletion
+
+Only the row the cursor is on is touched: the start of that row is found by scanning for line
+breaks up to it, and where the source is already split into lines just that line is rebuilt.
+"""
+
+import re
+
+from parso.utils import split_lines
+
+# the line breaks parso counts rows by
+_LINE_BREAK_RE = re.compile(r"\r\n?|\n")
+
+
+def line_offset(source, row):
+    """
+    Find where a row starts in the source, scanning only the rows before it
+
+    Args:
+        source (str): the text of the source
+        row (int): the row, starting at 1
+
+    Returns:
+        int: the offset of the first character of the row
+    """
+    if row <= 1:
+        return 0
+    for count, line_break in enumerate(_LINE_BREAK_RE.finditer(source), 2):
+        if count == row:
+            return line_break.end()
+    return len(source)
+
+
+def remove_quotes(source, position):
+    """
+    Remove the three characters before a position from the source
+
+    Args:
+        source (str): the text of the source
+        position (tuple): row, column of the cursor
+
+    Returns:
+        tuple: the source without the quotes, and the position moved back over them
+    """
+    offset = line_offset(source, position[0]) + position[1]
+    return source[: offset - 3] + source[offset:], (position[0], position[1] - 3)
+
+
+def remove_quotes_from_lines(lines, position):
+    """
+    Remove the three characters before a position from lines of source, in place
+
+    Args:
+        lines (list): the lines of the source, as split by
+            ``parso.utils.split_lines(source, keepends=True)``
+        position (tuple): row, column of the cursor
+
+    Returns:
+        tuple: the position moved back over the quotes
+    """
+    row, column = position
+    if column >= 3:
+        line = lines[row - 1]
+        lines[row - 1] = line[: column - 3] + line[column:]
+        return row, column - 3
+    # the quotes span a line break, which can change how the lines are split
+    source, position = remove_quotes("".join(lines), position)
+    lines[:] = split_lines(source, keepends=True)
+    return position
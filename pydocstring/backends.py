@@ -0,0 +1,575 @@
+"""
+Backends that read the information docstrings are generated from out of the source
+
+The formatters in :py:mod:`pydocstring.formatter` render from scope objects rather than from a
+syntax tree. A scope object describes one module, class or function, and is made by one of two
+backends:
+
+- :py:class:`ParsoScope` wraps a node of a parso tree. parso recovers from syntax errors, so it
+  handles a buffer in the middle of an edit
+- :py:class:`AstScope` reads a node of the standard library's :py:mod:`ast`, which is several
+  times faster and lighter than building a parso tree, but only for code that compiles
+
+Both give the same docstrings for code that compiles. :py:func:`iter_source_scopes` uses the
+:py:mod:`ast` backend when it can, and falls back to parso.
+"""
+
+import ast
+import re
+import sys
+from functools import partial
+
+from parso.utils import split_lines
+
+from pydocstring.format_utils import (
+    get_exception_name,
+    get_flow_statements,
+    get_param_info,
+    get_return_info,
+    safe_determine_type,
+)
+
+# Statement lists that can contain return and raise statements of a function, mirrors
+# format_utils.STATEMENT_CONTAINERS
+_STATEMENT_FIELDS = ("body", "handlers", "orelse", "finalbody")
+_NESTED_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+# an identifier as written at the start of the code of a node, up to what can follow it
+_IDENTIFIER_RE = re.compile(r"(?:async\s+)?(?:def\s+|class\s+)?([^\s:=,()\\]+)")
+
+
+def as_scope(node):
+    """
+    Get the scope object for a parso node, passing scope objects through
+
+    Args:
+        node (BaseNode or scope): a ``file_input``, ``classdef`` or ``funcdef`` node, or a scope
+            object from either backend
+
+    Returns:
+        ParsoScope or AstScope: the scope object
+    """
+    if isinstance(node, (ParsoScope, AstScope)):
+        return node
+    return ParsoScope(node)
+
+
+def iter_source_scopes(source, grammar=None, scope_filter=None):
+    """
+    Walk the module and every class and function in the source
+
+    Scopes are yielded in source order, enclosing scopes before the scopes nested in them, as
+    :py:func:`pydocstring.scopes.iter_scopes` does.
+
+    Args:
+        source (str): the text of the source
+        grammar (parso.Grammar): Grammar to parse with if the source doesn't compile, defaults
+            to parso's default grammar
+        scope_filter (ScopeFilter): only yield the scopes that pass this
+            :py:class:`pydocstring.scopes.ScopeFilter`. default: None
+
+    Returns:
+        iterator: an :py:class:`AstScope` for each scope if the source compiles, else a
+        :py:class:`ParsoScope` for each
+    """
+    try:
+        return iter_ast_scopes(source, scope_filter)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        pass
+    import parso
+    from pydocstring.scopes import iter_scopes
+
+    tree = (grammar or parso.load_grammar()).parse(source)
+    return (ParsoScope(scope) for scope in iter_scopes(tree, scope_filter))
+
+
+def iter_ast_scopes(source, scope_filter=None):
+    """
+    Walk the module and every class and function in source that compiles, with :py:mod:`ast`
+
+    Args:
+        source (str): the text of the source
+        scope_filter (ScopeFilter): only yield the scopes that pass this
+            :py:class:`pydocstring.scopes.ScopeFilter`. default: None
+
+    Raises:
+        SyntaxError: If the source doesn't compile, or the Python version is older than 3.8,
+            whose :py:mod:`ast` lacks end positions
+
+    Returns:
+        iterator: an :py:class:`AstScope` for each scope, in source order
+    """
+    if sys.version_info < (3, 8):  # pragma: no cover
+        raise SyntaxError("The ast backend requires Python 3.8")
+    module = ast.parse(source)
+    text = _SourceText(source)
+    if scope_filter is not None:
+        return _iter_filtered_ast_scopes(module, text, scope_filter)
+    return _iter_ast_scopes(module, text)
+
+
+def _iter_ast_scopes(module, text):
+    yield AstScope(module, text)
+    stack = list(reversed(module.body))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            yield AstScope(node, text)
+        stack.extend(reversed(list(_iter_child_statements(node))))
+
+
+def _iter_filtered_ast_scopes(module, text, scope_filter):
+    # scopes are only read into an AstScope once they pass the filter
+    if scope_filter.accepts("file_input", (), partial(_has_docstring, module)):
+        yield AstScope(module, text)
+    stack = [(node, ()) for node in reversed(module.body)]
+    while stack:
+        node, path = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            scope_type = "classdef" if isinstance(node, ast.ClassDef) else "funcdef"
+            path += (node.name,)
+            if scope_filter.accepts(scope_type, path, partial(_has_docstring, node)):
+                yield AstScope(node, text)
+            if not scope_filter.descends(scope_type, path):
+                continue
+        stack.extend((child, path) for child in reversed(list(_iter_child_statements(node))))
+
+
+def _has_docstring(node):
+    return ast.get_docstring(node, clean=False) is not None
+
+
+def _iter_child_statements(node):
+    for field in _STATEMENT_FIELDS:
+        for child in getattr(node, field, ()):
+            if isinstance(child, ast.excepthandler):
+                for statement in child.body:
+                    yield statement
+            else:
+                yield child
+    for case in getattr(node, "cases", ()):  # match statements
+        for statement in case.body:
+            yield statement
+
+
+def _statement_start(statement):
+    """
+    The line and column a statement starts at, including its decorators
+    """
+    decorators = getattr(statement, "decorator_list", None)
+    if decorators:
+        # the ``@`` of the first decorator, which is indented as the statement
+        return decorators[0].lineno, statement.col_offset
+    return statement.lineno, statement.col_offset
+
+
+class ParsoScope(object):
+    """
+    Scope information read from a parso tree
+
+    Args:
+        node (BaseNode): the ``file_input``, ``classdef`` or ``funcdef`` node
+    """
+
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def type(self):
+        """
+        str: ``file_input``, ``classdef`` or ``funcdef``
+        """
+        return self.node.type
+
+    @property
+    def name(self):
+        """
+        str or None: name of the class or function, None for the module
+        """
+        return self.node.name.value if self.node.type != "file_input" else None
+
+    @property
+    def start_pos(self):
+        """
+        tuple: row, column the scope starts at
+        """
+        return self.node.start_pos
+
+    @property
+    def end_pos(self):
+        """
+        tuple: row, column the scope ends at
+        """
+        return self.node.end_pos
+
+    def has_docstring(self):
+        """
+        Returns:
+            bool: whether the scope has a docstring, as parso's ``get_doc_node`` finds it
+        """
+        return self.node.get_doc_node() is not None
+
+    def body_start(self):
+        """
+        Returns:
+            tuple or None: row, column the first statement of the body starts at, where a
+            docstring would go. None if the body is on the line of the header, or is empty
+        """
+        if self.node.type == "file_input":
+            first = self.node.children[0]
+            return first.start_pos if first.type != "endmarker" else None
+        body = self.node.children[-1]
+        if body.type != "suite":
+            return None
+        return body.children[1].start_pos
+
+    def params(self):
+        """
+        Describe the parameters of a function
+
+        Returns:
+            list: star count, name, type and default of each parameter. Type and default are
+            None for ``*args`` and ``**kwargs``
+        """
+        params = []
+        for param in self.node.get_params():
+            if param.star_count:
+                params.append((param.star_count, param.name.value, None, None))
+            else:
+                params.append((0,) + get_param_info(param))
+        return params
+
+    def return_annotation(self):
+        """
+        Returns:
+            str or None: the return annotation of a function
+        """
+        annotation = self.node.annotation
+        return annotation.value if annotation else None
+
+    def flow_statements(self):
+        """
+        Describe the return statements, yield expressions and raise statements of a function
+
+        Returns:
+            tuple: lists of the type and expression of each return and yield, and the exception
+            name of each raise
+        """
+        annotation = self.node.annotation
+        returns, yields, raises = get_flow_statements(self.node)
+        return (
+            [get_return_info(ret, annotation) for ret in returns],
+            [get_return_info(yie, annotation) for yie in yields],
+            # a bare raise re-raises, it's just the keyword
+            [get_exception_name(exception) for exception in raises if exception.type != "keyword"],
+        )
+
+    def attributes(self):
+        """
+        Describe the attributes assigned in the body of a class or module
+
+        Yields:
+            tuple: name, type and value of each attribute
+        """
+        if self.node.type == "file_input":
+            statements = self.node.children
+        else:
+            statements = (
+                statement
+                for child in self.node.children
+                if child.type == "suite"
+                for statement in child.children
+            )
+        for statement in statements:
+            if statement.type == "simple_stmt":
+                for expression in statement.children:
+                    if expression.type == "expr_stmt":
+                        code = expression.get_rhs().get_code().strip()
+                        yield expression.children[0].value, safe_determine_type(code), code
+
+
+class AstScope(object):
+    """
+    Scope information read from an :py:mod:`ast` tree
+
+    Args:
+        node (ast.AST): the ``Module``, ``ClassDef``, ``FunctionDef`` or ``AsyncFunctionDef``
+            node
+        text (_SourceText): the source the tree was parsed from
+    """
+
+    __slots__ = ("node", "text", "type", "name", "start_pos", "end_pos")
+
+    def __init__(self, node, text):
+        self.node = node
+        self.text = text
+        if isinstance(node, ast.Module):
+            self.type = "file_input"
+            self.name = None
+            # as parso, from the first statement, after any comments
+            self.start_pos = self.end_pos = text.end_pos
+            if node.body:
+                self.start_pos = text.position(*_statement_start(node.body[0]))
+            return
+        self.type = "classdef" if isinstance(node, ast.ClassDef) else "funcdef"
+        row, column = text.position(node.lineno, node.col_offset)
+        self.name = self._identifier(node.name, text.lines[row - 1][column:])
+        if isinstance(node, ast.AsyncFunctionDef):
+            column = text.lines[row - 1].index("def", column + len("async"))
+        self.start_pos = (row, column)
+        # as parso, up to the end of the line break of the last line
+        last_line = text.lines[node.end_lineno - 1]
+        if last_line.endswith(("\n", "\r")):
+            self.end_pos = (node.end_lineno + 1, 0)
+        else:
+            self.end_pos = (node.end_lineno, len(last_line))
+
+    def has_docstring(self):
+        """
+        Returns:
+            bool: whether the scope has a docstring, as :py:func:`ast.get_docstring` finds it
+        """
+        return _has_docstring(self.node)
+
+    def body_start(self):
+        """
+        Returns:
+            tuple or None: row, column the first statement of the body starts at, where a
+            docstring would go. None if the body is on the line of the header, or is empty
+        """
+        if not self.node.body:
+            return None
+        row, column = self.text.position(*_statement_start(self.node.body[0]))
+        if self.text.lines[row - 1][:column].strip():
+            return None
+        if row > 1 and self.text.lines[row - 2].rstrip("\r\n").endswith("\\"):
+            return None  # continues the line of the header
+        return row, column
+
+    def params(self):
+        """
+        Describe the parameters of a function
+
+        Returns:
+            list: star count, name, type and default of each parameter. Type and default are
+            None for ``*args`` and ``**kwargs``
+        """
+        arguments = self.node.args
+        positional = getattr(arguments, "posonlyargs", []) + arguments.args
+        defaults = [None] * (len(positional) - len(arguments.defaults)) + arguments.defaults
+        params = [self._param(arg, default) for arg, default in zip(positional, defaults)]
+        if arguments.vararg:
+            params.append((1, self._arg_name(arguments.vararg), None, None))
+        params.extend(
+            self._param(arg, default)
+            for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults)
+        )
+        if arguments.kwarg:
+            params.append((2, self._arg_name(arguments.kwarg), None, None))
+        return params
+
+    def return_annotation(self):
+        """
+        Returns:
+            str or None: the return annotation of a function
+        """
+        returns = self.node.returns
+        return self.text.segment(returns) if returns else None
+
+    def flow_statements(self):
+        """
+        Describe the return statements, yield expressions and raise statements of a function
+
+        Returns:
+            tuple: lists of the type and expression of each return and yield, and the exception
+            name of each raise
+        """
+        annotation = self.return_annotation() or "TYPE"
+        returns = []
+        raises = []
+        stack = list(reversed(self.node.body))
+        while stack:
+            statement = stack.pop()
+            if isinstance(statement, ast.Return):
+                returns.append((annotation, self._expression(statement, "return")))
+            elif isinstance(statement, ast.Raise):
+                if statement.exc is not None:
+                    raises.append(self._exception_name(statement.exc))
+            elif not isinstance(statement, _NESTED_SCOPES):
+                stack.extend(reversed(list(_iter_child_statements(statement))))
+
+        yields = []
+        # most functions aren't generators, only walk every expression of those that may be
+        stack = [self.node.args, self.node.body] if self.text.contains(self.node, "yield") else []
+        if stack and self.node.returns:
+            stack.append(self.node.returns)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, (ast.Yield, ast.YieldFrom)):
+                yields.append(node)
+                stack.extend(ast.iter_child_nodes(node))
+            elif isinstance(node, _NESTED_SCOPES):
+                # parso walks the decorators of nested scopes, which sit outside them
+                stack.extend(getattr(node, "decorator_list", ()))
+            else:
+                stack.extend(ast.iter_child_nodes(node))
+        yields.sort(key=lambda node: (node.lineno, node.col_offset))
+        return (
+            returns,
+            [(annotation, self._expression(node, "yield")) for node in yields],
+            raises,
+        )
+
+    def attributes(self):
+        """
+        Describe the attributes assigned in the body of a class or module
+
+        Yields:
+            tuple: name, type and value of each attribute
+        """
+        node = self.node
+        if isinstance(node, ast.ClassDef) and not self._has_suite():
+            return  # parso only looks in an indented body
+        text = self.text
+        for statement in node.body:
+            if isinstance(statement, ast.Assign):
+                target = statement.targets[0]
+                last_target = statement.targets[-1]
+                separator = "="
+            elif isinstance(statement, ast.AugAssign):
+                target = last_target = statement.target
+                separator = "="
+            elif isinstance(statement, ast.AnnAssign):
+                target = statement.target
+                if statement.value is None:
+                    last_target, separator = target, ":"
+                else:
+                    last_target, separator = statement.annotation, "="
+            else:
+                continue
+            if isinstance(target, ast.Name):
+                name = self._identifier(target.id, text.segment(target))
+            else:
+                name = text.segment(target)
+            # from the end of the targets, so parentheses around the value are kept
+            code = text.between(last_target, statement).partition(separator)[2].strip()
+            yield name, safe_determine_type(code), code
+
+    def _param(self, arg, default):
+        annotation = self.text.segment(arg.annotation) if arg.annotation else None
+        if default is None:
+            return 0, self._arg_name(arg), annotation or "TYPE", ""
+        # as parso, the default includes what's between it and the ``=``
+        code = self.text.between(arg, default).partition("=")[2]
+        param_type = annotation or safe_determine_type(code)
+        return 0, self._arg_name(arg), param_type, " default: ``{0}``".format(code)
+
+    def _expression(self, node, keyword):
+        expression = self.text.segment(node)[len(keyword) :]
+        return " ".join(expression.split())
+
+    def _exception_name(self, node):
+        # as parso, the first name in the expression, e.g. ``module`` for ``module.Error()``
+        while not isinstance(node, ast.Name):
+            children = [child for child in ast.iter_child_nodes(node) if hasattr(child, "lineno")]
+            if not children:
+                return self.text.segment(node)
+            node = min(children, key=lambda child: (child.lineno, child.col_offset))
+        return self._identifier(node.id, self.text.segment(node))
+
+    def _arg_name(self, arg):
+        return self._identifier(arg.arg, self.text.segment(arg))
+
+    @staticmethod
+    def _identifier(name, code):
+        """
+        The identifier as written in the code. ast normalizes non-ASCII identifiers (NFKC), where
+        parso keeps them as written
+        """
+        if name.isascii():
+            return name
+        return _IDENTIFIER_RE.match(code).group(1)
+
+    def _has_suite(self):
+        """
+        Whether the body of a class starts on a new line, after its header
+        """
+        body = self.node.body[0]
+        header = self.node.bases + [keyword.value for keyword in self.node.keywords]
+        if not header:
+            return body.lineno > self.node.lineno
+        last = max(header, key=lambda node: (node.end_lineno, node.end_col_offset))
+        colon_onwards = self.text.gap(last, body).partition(":")[2]
+        return "\n" in colon_onwards or "\r" in colon_onwards
+
+
+class _SourceText(object):
+    """
+    Converts :py:mod:`ast` positions, whose columns are UTF-8 byte offsets, to text
+    """
+
+    __slots__ = ("source", "lines", "offsets", "end_pos")
+
+    def __init__(self, source):
+        self.source = source
+        self.lines = split_lines(source, keepends=True)
+        self.offsets = []
+        offset = 0
+        for line in self.lines:
+            self.offsets.append(offset)
+            offset += len(line)
+        self.end_pos = (len(self.lines), len(self.lines[-1]))
+
+    def position(self, lineno, col_offset):
+        """
+        The row and character column of an ast position
+        """
+        line = self.lines[lineno - 1]
+        if line.isascii():
+            return lineno, col_offset
+        return lineno, len(line.encode("utf-8")[:col_offset].decode("utf-8", "replace"))
+
+    def offset(self, lineno, col_offset):
+        row, column = self.position(lineno, col_offset)
+        return self.offsets[row - 1] + column
+
+    def segment(self, node):
+        """
+        The source text of a node
+        """
+        return self.source[
+            self.offset(node.lineno, node.col_offset) : self.offset(
+                node.end_lineno, node.end_col_offset
+            )
+        ]
+
+    def contains(self, node, text):
+        """
+        Whether the source text of a node contains some text
+        """
+        start = self.offset(node.lineno, node.col_offset)
+        end = self.offset(node.end_lineno, node.end_col_offset)
+        return self.source.find(text, start, end) != -1
+
+    def between(self, first, second):
+        """
+        The source text from the end of the first node to the end of the second
+        """
+        return self.source[
+            self.offset(first.end_lineno, first.end_col_offset) : self.offset(
+                second.end_lineno, second.end_col_offset
+            )
+        ]
+
+    def gap(self, first, second):
+        """
+        The source text from the end of the first node to the start of the second
+        """
+        return self.source[
+            self.offset(first.end_lineno, first.end_col_offset) : self.offset(
+                second.lineno, second.col_offset
+            )
+        ]
@@ -0,0 +1,259 @@
+"""
+Directory wide docstring generation, used by ``pydocstring batch``
+
+Files are found with :py:func:`os.scandir` and spread across a
+:py:class:`concurrent.futures.ProcessPoolExecutor`. Each worker loads the parso grammar once when
+it starts, and results are yielded as soon as each chunk of files is finished. Files that compile
+are read with the :py:mod:`ast` backend, see :py:mod:`pydocstring.backends`, and parso is only
+used for the rest.
+
+:py:func:`write_ndjson` streams the results as newline delimited JSON, one record per scope, for
+tools that consume them while a long run is still going.
+
+With a :py:class:`pydocstring.diskcache.DiskCache`, files whose contents haven't changed since a
+previous run aren't parsed again. The cache holds the :py:mod:`pydocstring.ir` of each scope
+rather than rendered docstrings, so it's shared by runs in every style.
+"""
+
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from time import perf_counter
+
+import parso
+from parso.utils import python_bytes_to_unicode
+
+from pydocstring.backends import iter_source_scopes
+from pydocstring.diskcache import DiskCache
+from pydocstring.formatter import get_formatter
+from pydocstring.ir import extract_scope, load_scope
+from pydocstring.scopes import scope_docstring
+
+FileResult = namedtuple("FileResult", ("path", "docstrings", "error", "seconds"))
+FileResult.__doc__ = """
+The docstrings generated for one file
+
+Attributes:
+    path (str): path of the file
+    docstrings (list): a :py:class:`pydocstring.scopes.ScopeDocstring` for each scope
+    error (str or None): description of the error if the file could not be processed
+    seconds (float): how long processing the file took
+"""
+
+_GRAMMAR = None
+_DISK_CACHE = None
+
+
+def _init_worker(cache_path=None):
+    """
+    Load the grammar, and open the disk cache, once per worker process
+    """
+    global _GRAMMAR, _DISK_CACHE
+    _GRAMMAR = parso.load_grammar()
+    if cache_path is not None:
+        _DISK_CACHE = DiskCache(cache_path)
+
+
+def iter_python_files(paths):
+    """
+    Find the python files in the given files and directories
+
+    Directories are searched recursively, skipping hidden directories and ``__pycache__``.
+
+    Args:
+        paths (list): file and directory paths
+
+    Yields:
+        str: path of each python file
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        stack = [path]
+        while stack:
+            directory = stack.pop()
+            with os.scandir(directory) as listing:
+                entries = sorted(listing, key=lambda entry: entry.name)
+            subdirectories = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith(".") and entry.name != "__pycache__":
+                        subdirectories.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    yield entry.path
+            stack.extend(reversed(subdirectories))
+
+
+def process_file(path, formatter="google", disk_cache=None, scope_filter=None):
+    """
+    Generate the docstrings for every scope in a file
+
+    Args:
+        path (str): path of the file
+        formatter (str): the format of the docstring choose from google, numpy, reST.
+        disk_cache (DiskCache): cache to look the file's scopes up in, keyed on its contents and
+            the filter, and to store them in after reading them. default: None
+        scope_filter (ScopeFilter): only generate docstrings for the scopes that pass this
+            :py:class:`pydocstring.scopes.ScopeFilter`. default: None
+
+    Returns:
+        FileResult: the generated docstrings, or the error that stopped generation
+    """
+    if _GRAMMAR is None:
+        _init_worker()
+    start = perf_counter()
+    try:
+        with open(path, "rb") as source_file:
+            source = python_bytes_to_unicode(source_file.read(), errors="replace")
+        formatter = get_formatter(formatter)
+        scopes = None
+        if disk_cache is not None:
+            key = disk_cache.key("scopes", source, *_filter_key(scope_filter))
+            cached = disk_cache.get(key)
+            if cached is not None:
+                scopes = [load_scope(scope) for scope in cached]
+        if scopes is None:
+            scopes = [
+                extract_scope(scope)
+                for scope in iter_source_scopes(source, _GRAMMAR, scope_filter)
+            ]
+            if disk_cache is not None:
+                disk_cache.set(key, scopes)
+        docstrings = [scope_docstring(scope, formatter) for scope in scopes]
+    except Exception as ex:
+        return FileResult(path, [], repr(ex), perf_counter() - start)
+    return FileResult(path, docstrings, None, perf_counter() - start)
+
+
+def _filter_key(scope_filter):
+    if scope_filter is None:
+        return []
+    return [[scope_filter.undocumented, scope_filter.public, scope_filter.names]]
+
+
+def _process_chunk(paths, formatter, scope_filter):
+    return [process_file(path, formatter, _DISK_CACHE, scope_filter) for path in paths]
+
+
+def _iter_chunks(paths, chunksize):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(
+    paths, formatter="google", workers=None, chunksize=16, cache_path=None, scope_filter=None
+):
+    """
+    Generate docstrings for every python file in the given files and directories
+
+    Only a couple of chunks per worker are in flight at once, so results don't pile up in memory
+    on large runs.
+
+    Args:
+        paths (list): file and directory paths
+        formatter (str): the format of the docstring choose from google, numpy, reST.
+        workers (int): number of worker processes, default: the number of CPUs. With ``1`` the
+            files are processed in this process
+        chunksize (int): number of files handed to a worker at a time. default: ``16``
+        cache_path (str): path of a :py:class:`pydocstring.diskcache.DiskCache` database to
+            reuse the results of previous runs from, shared by all the workers. default: None
+        scope_filter (ScopeFilter): only generate docstrings for the scopes that pass this
+            :py:class:`pydocstring.scopes.ScopeFilter`. default: None
+
+    Yields:
+        FileResult: the result for each file, in the order they finish
+    """
+    get_formatter(formatter)  # fail fast on an unknown formatter, not once per file
+    files = iter_python_files(paths)
+    if workers == 1:
+        disk_cache = DiskCache(cache_path) if cache_path is not None else None
+        try:
+            for path in files:
+                yield process_file(path, formatter, disk_cache, scope_filter)
+        finally:
+            if disk_cache is not None:
+                disk_cache.close()
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(cache_path,)
+    ) as executor:
+        max_pending = workers * 2
+        chunks = _iter_chunks(files, chunksize)
+        pending = set()
+        while True:
+            for chunk in chunks:
+                pending.add(executor.submit(_process_chunk, chunk, formatter, scope_filter))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    yield result
+
+
+def file_records(result):
+    """
+    The records :py:func:`write_ndjson` writes for one file
+
+    Args:
+        result (FileResult): the result for the file
+
+    Returns:
+        list: a dict for each scope, with the ``file``, the ``start`` and ``end`` row, column of
+        the scope, its ``scope_type``, ``name`` and ``docstring``, and the ``seconds`` processing
+        the file took. A file that could not be processed has one record, with the ``file``,
+        ``error`` and ``seconds``
+    """
+    if result.error is not None:
+        return [{"file": result.path, "error": result.error, "seconds": result.seconds}]
+    return [
+        {
+            "file": result.path,
+            "start": docstring.start_pos,
+            "end": docstring.end_pos,
+            "scope_type": docstring.scope_type,
+            "name": docstring.name,
+            "docstring": docstring.docstring,
+            "seconds": result.seconds,
+        }
+        for docstring in result.docstrings
+    ]
+
+
+def write_ndjson(results, stream):
+    """
+    Write results as newline delimited JSON, one record per scope, see :py:func:`file_records`
+
+    Each file's records are written and flushed as soon as the file is finished, and nothing is
+    kept once it's written, so with :py:func:`run_batch` only the files in flight are ever held
+    in memory.
+
+    Args:
+        results (iterable): the :py:class:`FileResult` of each file, e.g. from
+            :py:func:`run_batch`
+        stream (file): text stream to write to
+
+    Returns:
+        int: the number of files that could not be processed
+    """
+    failed = 0
+    for result in results:
+        if result.error is not None:
+            failed += 1
+        stream.write(
+            "".join(json.dumps(record) + "\n" for record in file_records(result))
+        )
+        stream.flush()
+    return failed
@@ -0,0 +1,214 @@
+"""
+Parse caching for editor integrations
+
+Editors ask for docstrings over and over for the same buffer while the user types. Rather than
+re-parsing the whole buffer every time, a :py:class:`ParseCache` keeps the last parso module for
+each buffer and feeds new text through parso's diff parser, so only the changed region is
+re-parsed.
+"""
+
+import threading
+from collections import OrderedDict
+
+import parso
+from parso.utils import split_lines
+
+from pydocstring.scopes import ScopeIndex, find_scope
+
+
+def reparse(grammar, module, old_lines, new_lines):
+    """
+    Update a parsed module for changed source, re-parsing only the changed region
+
+    The module is changed in place.
+
+    Args:
+        grammar (parso.Grammar): the grammar the module was parsed with
+        module (Module): the module parsed from `old_lines`
+        old_lines (list): the lines the module was parsed from, as split by
+            ``parso.utils.split_lines(source, keepends=True)``
+        new_lines (list): the lines of the changed source
+
+    Returns:
+        Module: the module for `new_lines`
+    """
+    # parso's own ``diff_cache`` option keeps modules in a global, path keyed cache that
+    # we can't evict from, so drive the diff parser directly
+    try:
+        return grammar._diff_parser(
+            grammar._pgen_grammar, grammar._tokenizer, module
+        ).update(old_lines=old_lines, new_lines=new_lines)
+    except Exception:  # pragma: no cover
+        # the diff parser is experimental, a full parse is always correct
+        return grammar.parse("".join(new_lines))
+
+
+class _CacheEntry(object):
+    """
+    A cached buffer: its source text, the lines its module was parsed from, and the scope index
+    of the module once it has been queried more than once
+    """
+
+    __slots__ = ("source", "lines", "module", "scope_index", "queries")
+
+    def __init__(self, source, lines, module):
+        self.source = source
+        self.lines = lines
+        self.module = module
+        self.scope_index = None
+        self.queries = 0
+
+
+class ParseCache(object):
+    """
+    LRU cache of parso modules, keyed by a caller supplied buffer id
+
+    Entries are evicted least recently used first, whenever the cache holds more than
+    ``max_buffers`` buffers or the cached source totals more than ``max_bytes`` characters.
+
+    Args:
+        max_buffers (int): Maximum number of buffers to keep. default: ``16``
+        max_bytes (int): Maximum total length of cached source text. default: ``32 MiB``
+        grammar (parso.Grammar): Grammar to parse with, defaults to parso's default grammar
+
+    Attributes:
+        lock (threading.RLock): held by every method. Parsing a buffer again updates its module
+            in place, so hold it while reading anything from a module the cache returned
+    """
+
+    def __init__(self, max_buffers=16, max_bytes=32 * 1024 * 1024, grammar=None):
+        self.max_buffers = max_buffers
+        self.max_bytes = max_bytes
+        self.grammar = grammar or parso.load_grammar()
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, buffer_id):
+        return buffer_id in self._entries
+
+    def parse(self, source, buffer_id):
+        """
+        Parse the source of a buffer, re-using the last parse of that buffer if there is one
+
+        Note that the module returned from a previous call for the same buffer is updated in
+        place, don't hold on to it across calls, and hold :py:attr:`lock` while reading it if
+        other threads use the cache.
+
+        Args:
+            source (str): the text of the buffer
+            buffer_id (hashable): identifies the buffer
+
+        Returns:
+            Module: the parsed module
+        """
+        return self.parse_lines(split_lines(source, keepends=True), buffer_id, source)
+
+    def parse_lines(self, lines, buffer_id, source):
+        """
+        Parse lines of source for a buffer, re-using the last parse of that buffer if there is one
+
+        The lines need not be the lines of `source`, e.g. when parsing the buffer with an edit
+        applied that the editor doesn't have.
+
+        Args:
+            lines (list): the lines to parse, as split by
+                ``parso.utils.split_lines(source, keepends=True)``. The cache keeps the list,
+                don't modify it afterwards
+            buffer_id (hashable): identifies the buffer
+            source (str): the text of the buffer, returned by :py:meth:`get_source`
+
+        Returns:
+            Module: the parsed module
+        """
+        with self.lock:
+            entry = self._entries.pop(buffer_id, None)
+            if entry is not None:
+                self.total_bytes -= len(entry.source)
+                entry.source = source
+                if entry.lines != lines:
+                    entry.module = reparse(self.grammar, entry.module, entry.lines, lines)
+                    entry.lines = lines
+                    entry.scope_index = None
+                    entry.queries = 0
+            else:
+                entry = _CacheEntry(source, lines, self.grammar.parse("".join(lines)))
+            self._entries[buffer_id] = entry
+            self.total_bytes += len(source)
+            self._evict()
+            return entry.module
+
+    def find_scope(self, buffer_id, tree, position):
+        """
+        Find the innermost scope containing a position in a buffer's module
+
+        The first query against a parse searches the tree directly. Once the same parse is
+        queried again a :py:class:`pydocstring.scopes.ScopeIndex` is built for it, so further
+        queries are a binary search, until the buffer changes.
+
+        Args:
+            buffer_id (hashable): identifies the buffer
+            tree (Module): the module returned by :py:meth:`parse` for the buffer
+            position (tuple): row, column. Rows start at 1, columns start at 0
+
+        Returns:
+            BaseNode: the ``file_input``, ``classdef`` or ``funcdef`` node
+        """
+        with self.lock:
+            entry = self._entries.get(buffer_id)
+            if entry is None or entry.module is not tree:
+                # evicted, or too big to cache
+                return find_scope(tree, position)
+            if entry.scope_index is None:
+                entry.queries += 1
+                if entry.queries < 2:
+                    return find_scope(tree, position)
+                entry.scope_index = ScopeIndex(tree)
+            return entry.scope_index.find(position)
+
+    def get_source(self, buffer_id):
+        """
+        Get the source last parsed for a buffer
+
+        Args:
+            buffer_id (hashable): identifies the buffer
+
+        Returns:
+            str or None: The source, or None if the buffer is not cached
+        """
+        with self.lock:
+            entry = self._entries.get(buffer_id)
+            return entry.source if entry is not None else None
+
+    def invalidate(self, buffer_id):
+        """
+        Drop a buffer from the cache, e.g. when it is closed in the editor
+
+        Args:
+            buffer_id (hashable): identifies the buffer
+        """
+        with self.lock:
+            entry = self._entries.pop(buffer_id, None)
+            if entry is not None:
+                self.total_bytes -= len(entry.source)
+
+    def clear(self):
+        """
+        Drop all buffers from the cache
+        """
+        with self.lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_buffers or self.total_bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self.total_bytes -= len(entry.source)
+
+
+BUFFER_CACHE = ParseCache()
@@ -1,20 +1,20 @@
 """
 pydocstring CLI provides entrypoints for CLI commands
 
-Currently only the ``pydocstring`` command is supported
+Two commands are provided, ``pydocstring`` and the ``pydocstring-lsp`` language server
 
 To use pydocstring from the command line you call ``pydocstring`` with the source, and optionally
 the position of the cursor within that source (defaults to the end).
 
-Note that pydocstring doesn't insert docstrings in place (yet), as it's designed for editor
-integration.
 It prints out the generated docstring for the scope the given cursor position is in.
 
 You may also want to provide the ``-f`` flag with the formatter you want to use.
 
 .. code-block:: text
 
-    usage: pydocstring [-h] [-f {google,numpy,reST}] [--version] source [position]
+    usage: pydocstring [-h] [-f {google,numpy,reST}] [--version] [--debug] [--serve]
+                       [--write FILE [FILE ...]] [--public] [--name PATTERN]
+                       [source] [position]
 
     positional arguments:
     source                Source code to process, or the path to a file
@@ -26,6 +26,48 @@ You may also want to provide the ``-f`` flag with the formatter you want to use.
     -f {google,numpy,reST}, --formatter {google,numpy,reST}
                             docstring formatter to use
     --version             show program's version number and exit
+    --debug               Show stacktraces
+    --serve               Stay alive and answer newline delimited JSON requests on
+                          stdin
+    --write FILE [FILE ...]
+                          Insert docstrings in place, into every module, class and
+                          function in the files that doesn't have one
+    --public              With --write or batch, only public modules, classes and
+                          functions
+    --name PATTERN        With --write or batch, only classes and functions whose
+                          name or dotted path matches the glob pattern, may be
+                          repeated
+
+``--write`` parses each file once and rewrites it atomically, see :py:mod:`pydocstring.rewrite`.
+Files that don't compile are left as they are.
+
+To generate docstrings for every module, class and function in a tree of files, use
+``pydocstring batch``, which spreads the files over a pool of worker processes.
+
+.. code-block:: text
+
+    usage: pydocstring batch [-h] [-f {google,numpy,reST}] [-j WORKERS]
+                             [--chunksize CHUNKSIZE] [--cache CACHE]
+                             [--undocumented] [--public] [--name PATTERN]
+                             [--ndjson]
+                             paths [paths ...]
+
+``--cache`` names a SQLite database that results are kept in between runs, so files that haven't
+changed aren't processed again. ``--undocumented`` skips the scopes that already have a
+docstring, and ``--public`` and ``--name`` narrow the scopes as for ``--write``. With
+``--ndjson`` the results are written as newline delimited JSON, one record per scope with its
+file, range, scope type, docstring and the time the file took, flushed as each file finishes, see
+:py:func:`pydocstring.batch.write_ndjson`.
+
+Editor integrations that call pydocstring often should use ``pydocstring --serve``, which keeps
+the parser warm between requests, see :py:mod:`pydocstring.server` for the protocol.
+
+Editors with a Language Server Protocol client can instead start ``pydocstring-lsp``, see
+:py:mod:`pydocstring.lsp`.
+
+.. code-block:: text
+
+    usage: pydocstring-lsp [-h] [-f {google,numpy,reST}]
 
 """
 import sys  # pragma: no cover
@@ -33,16 +75,25 @@ import os  # pragma: no cover
 import argparse  # pragma: no cover
 import ast  # pragma: no cover
 import pydocstring  # pragma: no cover
-from pydocstring import exc  # pragma: no cover
+
+# the commands import what they need once the arguments are parsed, so ``--version``, ``--help``
+# and argument errors don't wait for parso to be imported
 
 
 def main():  # pragma: no cover
     """
     CLI entrypoint
     """
+    if sys.argv[1:2] == ["batch"]:
+        batch_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(prog="pydocstring")
     parser.add_argument(
-        "source", type=str, help="Source code to process, or the path to a file"
+        "source",
+        nargs="?",
+        type=str,
+        help="Source code to process, or the path to a file",
     )
     parser.add_argument(
         "position",
@@ -65,7 +116,32 @@ def main():  # pragma: no cover
         version="%(prog)s {0}".format(pydocstring.__version__),
     )
     parser.add_argument("--debug", action="store_true", help="Show stacktraces")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Stay alive and answer newline delimited JSON requests on stdin",
+    )
+    parser.add_argument(
+        "--write",
+        nargs="+",
+        metavar="FILE",
+        help="Insert docstrings in place, into every module, class and function in the files \
+                            that doesn't have one",
+    )
+    _add_filter_arguments(parser)
     args = parser.parse_args()
+
+    if args.write:
+        write_main(args)
+        return
+    if args.serve:
+        from pydocstring.server import serve
+
+        serve()
+        return
+    if args.source is None:
+        parser.error("the following arguments are required: source")
+
     source = args.source
 
     if os.path.exists(args.source):
@@ -87,3 +163,152 @@ def main():  # pragma: no cover
         sys.stderr.write("Could not generate a docstring for the given source:\n")
         sys.stderr.write(repr(ex))
         sys.exit(1)
+
+
+def write_main(args):  # pragma: no cover
+    """
+    ``pydocstring --write`` entrypoint, inserts docstrings into files in place
+    """
+    from pydocstring.rewrite import write_docstrings
+
+    failed = False
+    for path in args.write:
+        try:
+            if write_docstrings(
+                path, formatter=args.formatter, public=args.public, names=args.name
+            ):
+                print("Inserted docstrings into {0}".format(path))
+        except Exception as ex:
+            if args.debug:
+                raise ex
+            failed = True
+            sys.stderr.write("Could not insert docstrings into {0}:\n{1!r}\n".format(path, ex))
+    if failed:
+        sys.exit(1)
+
+
+def batch_main(argv):  # pragma: no cover
+    """
+    ``pydocstring batch`` entrypoint, generates docstrings for every scope in a tree of files
+    """
+    parser = argparse.ArgumentParser(prog="pydocstring batch")
+    parser.add_argument(
+        "paths", nargs="+", type=str, help="Python files or directories to process"
+    )
+    parser.add_argument(
+        "-f",
+        "--formatter",
+        choices=["google", "numpy", "reST"],
+        default="google",
+        type=str,
+        help="docstring formatter to use",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes, defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=16,
+        help="number of files handed to a worker at a time",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        help="database file to reuse the results of previous runs from",
+    )
+    parser.add_argument(
+        "--undocumented",
+        action="store_true",
+        help="skip modules, classes and functions that already have a docstring",
+    )
+    _add_filter_arguments(parser)
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="write newline delimited JSON, one record per scope, as each file finishes",
+    )
+    args = parser.parse_args(argv)
+
+    from pydocstring.batch import run_batch, write_ndjson
+    from pydocstring.scopes import ScopeFilter
+
+    scope_filter = None
+    if args.undocumented or args.public or args.name:
+        scope_filter = ScopeFilter(args.undocumented, args.public, args.name)
+
+    results = run_batch(
+        args.paths,
+        formatter=args.formatter,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        cache_path=args.cache,
+        scope_filter=scope_filter,
+    )
+    if args.ndjson:
+        if write_ndjson(results, sys.stdout):
+            sys.exit(1)
+        return
+
+    failed = False
+    for result in results:
+        if result.error:
+            failed = True
+            sys.stderr.write(
+                "Could not generate docstrings for {0}:\n{1}\n".format(
+                    result.path, result.error
+                )
+            )
+            continue
+        for docstring in result.docstrings:
+            print(
+                "{0}:{1}:{2}: {3} {4}".format(
+                    result.path,
+                    docstring.start_pos[0],
+                    docstring.start_pos[1],
+                    docstring.scope_type,
+                    docstring.name or "",
+                ).rstrip()
+            )
+            print('"""\n' + docstring.docstring + '"""\n')
+        sys.stdout.flush()
+    if failed:
+        sys.exit(1)
+
+
+def _add_filter_arguments(parser):  # pragma: no cover
+    parser.add_argument(
+        "--public", action="store_true", help="only public modules, classes and functions"
+    )
+    parser.add_argument(
+        "--name",
+        action="append",
+        metavar="PATTERN",
+        help="only classes and functions whose name or dotted path matches the glob pattern, \
+                            may be repeated",
+    )
+
+
+def lsp_main():  # pragma: no cover
+    """
+    ``pydocstring-lsp`` entrypoint, a language server over stdio
+    """
+    parser = argparse.ArgumentParser(prog="pydocstring-lsp")
+    parser.add_argument(
+        "-f",
+        "--formatter",
+        choices=["google", "numpy", "reST"],
+        default="google",
+        type=str,
+        help="docstring formatter to use, unless the client picks one when it initializes",
+    )
+    args = parser.parse_args()
+
+    from pydocstring.lsp import LanguageServer
+
+    sys.exit(LanguageServer(formatter=args.formatter).serve())
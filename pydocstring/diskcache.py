@@ -0,0 +1,183 @@
+"""
+Persistent, content addressed cache of generated docstrings
+
+Results are stored in a SQLite database in WAL mode, keyed by a hash of the source text they were
+generated from, the pydocstring version and, for rendered docstrings, the formatter templates,
+so they are reused across runs for as long as the code they document doesn't change. Any number
+of processes can read and write the same database, e.g. the workers of ``pydocstring batch``.
+The total size of the stored results is kept up to date by triggers, so every write checks it
+cheaply and once it grows past ``max_bytes`` the least recently used results are evicted, however
+few writes each process makes.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pydocstring
+
+# Seconds a result's last access time is kept after a hit, rather than written again, so warm
+# runs mostly read
+_TOUCH_INTERVAL = 60 * 60
+
+# The total size of the stored results, kept in a single row by the triggers
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS docstrings ("
+    " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+    " size INTEGER NOT NULL, accessed REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS docstrings_accessed ON docstrings (accessed)",
+    "CREATE TABLE IF NOT EXISTS docstrings_size ("
+    " id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)",
+    "CREATE TRIGGER IF NOT EXISTS docstrings_insert AFTER INSERT ON docstrings BEGIN"
+    " UPDATE docstrings_size SET total = total + new.size; END",
+    "CREATE TRIGGER IF NOT EXISTS docstrings_update AFTER UPDATE OF size ON docstrings BEGIN"
+    " UPDATE docstrings_size SET total = total + new.size - old.size; END",
+    "CREATE TRIGGER IF NOT EXISTS docstrings_delete AFTER DELETE ON docstrings BEGIN"
+    " UPDATE docstrings_size SET total = total - old.size; END",
+    # after the triggers, so results written meanwhile are counted once
+    "INSERT OR IGNORE INTO docstrings_size (id, total)"
+    " SELECT 0, COALESCE(SUM(size), 0) FROM docstrings",
+)
+
+
+class DiskCache(object):
+    """
+    A SQLite backed docstring cache
+
+    Args:
+        path (str): path of the database file, created if it doesn't exist
+        max_bytes (int): size of stored results to evict down to. default: ``256 MiB``
+        timeout (float): seconds to wait for another process's write to finish. default: ``30``
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, timeout=30.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._connection.execute(statement)
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM docstrings").fetchone()[0]
+
+    @staticmethod
+    def key(*parts):
+        """
+        Make a cache key from the source text and everything else the result depends on
+
+        Args:
+            *parts: strings, numbers or lists of them, e.g. the source, formatter fingerprint
+                and cursor position
+
+        Returns:
+            str: the key
+        """
+        digest = hashlib.sha256(pydocstring.__version__.encode("utf-8"))
+        for part in parts:
+            digest.update(b"\0")
+            digest.update(json.dumps(part).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Look up a stored result
+
+        Args:
+            key (str): from :py:meth:`key`
+
+        Returns:
+            object: the stored result, or None if there isn't one
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, accessed FROM docstrings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] >= _TOUCH_INTERVAL:
+                self._connection.execute(
+                    "UPDATE docstrings SET accessed = ? WHERE key = ?", (now, key)
+                )
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        """
+        Store a result
+
+        Args:
+            key (str): from :py:meth:`key`
+            value (object): the result, anything that can be serialized to JSON
+        """
+        value = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                # not INSERT OR REPLACE, its implicit delete doesn't fire the delete trigger
+                cursor = self._connection.execute(
+                    "UPDATE docstrings SET value = ?, size = ?, accessed = ? WHERE key = ?",
+                    (value, len(value), now, key),
+                )
+                if not cursor.rowcount:
+                    self._connection.execute(
+                        "INSERT INTO docstrings (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                        (key, value, len(value), now),
+                    )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+            if self._total() > self.max_bytes:
+                self._evict()
+
+    def evict(self):
+        """
+        Remove the least recently used results until the rest fit in ``max_bytes``
+        """
+        with self._lock:
+            self._evict()
+
+    def close(self):
+        """
+        Close the database connection
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _total(self):
+        return self._connection.execute("SELECT total FROM docstrings_size").fetchone()[0]
+
+    def _evict(self):
+        if self._total() <= self.max_bytes:
+            return
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            # again, now that no other process can write
+            excess = self._total() - self.max_bytes
+            cursor = self._connection.execute(
+                "SELECT key, size FROM docstrings ORDER BY accessed"
+            )
+            evicted = []
+            for key, size in cursor:
+                if excess <= 0:
+                    break
+                evicted.append((key,))
+                excess -= size
+            cursor.close()
+            self._connection.executemany("DELETE FROM docstrings WHERE key = ?", evicted)
+            self._connection.execute("COMMIT")
+        except Exception:
+            self._connection.execute("ROLLBACK")
+            raise
@@ -1,28 +1,130 @@
 """Provides helper utilities for formatting"""
 
 import ast
+import itertools
+import re
+from functools import lru_cache
+
+# Nodes that can contain return and raise statements of a function, mirrors parso's
+# ``iter_return_stmts`` and ``iter_raise_stmts``
+STATEMENT_CONTAINERS = frozenset(
+    [
+        "suite",
+        "simple_stmt",
+        "if_stmt",
+        "while_stmt",
+        "for_stmt",
+        "try_stmt",
+        "with_stmt",
+        "async_stmt",
+    ]
+)
+NESTED_SCOPES = frozenset(["classdef", "funcdef", "lambdef"])
+
+# Literals longer than this are typed by their brackets rather than evaluated
+LITERAL_EVAL_SIZE_LIMIT = 10000
+# Number of evaluated literal types to remember
+TYPE_CACHE_SIZE = 1024
+
+_SIMPLE_LITERALS = {
+    "None": "NoneType",
+    "True": "bool",
+    "False": "bool",
+    "[]": "list",
+    "()": "tuple",
+    "{}": "dict",
+}
+_INT_RE = re.compile(r"[-+]?(?:0|[1-9](?:_?[0-9])*)\Z")
+_FLOAT_RE = re.compile(r"[-+]?(?:[0-9]+\.[0-9]*|\.[0-9]+|[0-9]+(?=[eE]))(?:[eE][-+]?[0-9]+)?\Z")
+# a single, single line, str literal. Bytes, f-strings and concatenations are left to literal_eval
+_STR_RE = re.compile(r"""[rRuU]?(?:'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")\Z""")
+_CONTAINER_BRACKETS = {"[": "]", "(": ")", "{": "}"}
 
 
 def safe_determine_type(string):
     """
     Determine the python type of the given literal, for use in docstrings
 
+    Common simple literals are recognised from their text, anything else is evaluated with
+    :py:func:`ast.literal_eval` (remembering recent results). Values longer than
+    :py:data:`LITERAL_EVAL_SIZE_LIMIT` are never evaluated, their type is guessed from the
+    surrounding brackets.
+
     Args:
         string (str): The string to evaluate
 
     Returns:
         ``str``: The type, or "TYPE" if the type could not be determined
     """
+    string = string.strip()
+    simple_type = _SIMPLE_LITERALS.get(string)
+    if simple_type:
+        return simple_type
+    if _INT_RE.match(string):
+        return "int"
+    if _FLOAT_RE.match(string):
+        return "float"
+    if _STR_RE.match(string):
+        return "str"
+    if string.startswith("set("):
+        return "set"
+    if len(string) > LITERAL_EVAL_SIZE_LIMIT:
+        return _container_type(string)
+    return _literal_type(string)
+
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def _literal_type(string):
     try:
         return ast.literal_eval(string).__class__.__name__
-    except ValueError:
-        try:
-            if string.startswith("set(") or isinstance(
-                ast.literal_eval(string.replace("{", "[").replace("}", "]")), list
-            ):
-                return "set"
-        except ValueError:
-            return "TYPE"
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return "TYPE"
+
+
+def _container_type(string):
+    """
+    Guess the type of a container literal from its brackets, without evaluating it
+    """
+    closing = _CONTAINER_BRACKETS.get(string[0])
+    if closing is None or string[-1] != closing:
+        return "TYPE"
+    if string[0] == "[":
+        return "list"
+    separator = _first_separator(string)
+    if string[0] == "(":
+        # without a comma it's only parentheses, e.g. around an implicitly concatenated string
+        return "tuple" if separator == "," else "TYPE"
+    # a dict if the first item has a colon
+    return "dict" if separator == ":" else "set"
+
+
+def _first_separator(string):
+    """
+    The first ``,`` or ``:`` after the opening bracket, outside any nested brackets or strings,
+    or None if the opening bracket is closed first
+    """
+    depth = 0
+    quote = None
+    escaped = False
+    for char in itertools.islice(string, 1, None):
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            if not depth:
+                return None
+            depth -= 1
+        elif not depth and char in ",:":
+            return char
+    return None
 
 
 def get_param_info(param):
@@ -56,6 +158,9 @@ def get_return_info(ret, annotation):
         tuple: type, expression after 'return' keyword
     """
     ret_type = annotation.value if annotation else "TYPE"
+    if ret.type == "keyword":
+        # a bare return or yield is just the keyword
+        return ret_type, ""
     expression = "".join(x.get_code().strip() for x in ret.children[1:])
     expression = " ".join(expression.split())
     return ret_type, expression
@@ -75,3 +180,49 @@ def get_exception_name(node):
     while not name.type == "name":
         name = name.children[0]
     return name.value
+
+
+def get_flow_statements(parso_function):
+    """
+    Collect the return statements, yield expressions and raise statements of a function
+
+    The function body is traversed once, instead of once each for parso's
+    ``iter_return_stmts``, ``iter_yield_exprs`` and ``iter_raise_stmts``, but the same nodes
+    are found in the same order.
+
+    Args:
+        parso_function (Function): The function tree node
+
+    Returns:
+        tuple: lists of the return, yield and raise nodes
+    """
+    returns = []
+    yields = []
+    raises = []
+    # (node, whether the node is reachable through statement containers only)
+    stack = [(child, True) for child in reversed(parso_function.children)]
+    while stack:
+        element, statement = stack.pop()
+        element_type = element.type
+        if statement:
+            if element_type == "return_stmt":
+                returns.append(element)
+            elif element_type == "raise_stmt":
+                raises.append(element)
+            elif element_type == "keyword":
+                if element.value == "return":
+                    returns.append(element)
+                elif element.value == "raise":
+                    raises.append(element)
+        if element_type in NESTED_SCOPES:
+            continue
+        try:
+            children = element.children
+        except AttributeError:
+            if element.value == "yield":
+                parent = element.parent
+                yields.append(parent if parent.type == "yield_expr" else element)
+            continue
+        statement = statement and element_type in STATEMENT_CONTAINERS
+        stack.extend((child, statement) for child in reversed(children))
+    return returns, yields, raises
@@ -1,22 +1,198 @@
 """
 Google Docstring Formatter
 """
-from parso.python.tree import (
-    Class,
-    ExprStmt,
-    Function,
-    KeywordStatement,
-    Module,
-    Name,
-    PythonNode,
-)
-
-from pydocstring.format_utils import (
-    get_exception_name,
-    get_param_info,
-    get_return_info,
-    safe_determine_type,
-)
+import hashlib
+from operator import itemgetter
+from string import Formatter as _TemplateParser
+
+import pydocstring
+from pydocstring import exc
+from pydocstring.ir import extract_scope
+
+# Number of positional arguments each template is rendered with, ``0`` for plain strings
+TEMPLATE_ARGUMENTS = {
+    "start_args_block": 0,
+    "param_placeholder": 3,
+    "param_placeholder_args": 2,
+    "param_placeholder_kwargs": 2,
+    "start_return_block": 0,
+    "return_placeholder": 2,
+    "return_annotation_placeholder": 1,
+    "start_yield_block": 0,
+    "yield_placeholder": 2,
+    "start_raise_block": 0,
+    "raise_placeholder": 1,
+    "start_attributes": 0,
+    "attribute_placeholder": 3,
+}
+
+
+class Formatter(object):
+    """
+    A docstring style, compiled from a style definition
+
+    The definition is a dict like those in :py:data:`pydocstring.FORMATTER`. It is validated when
+    the formatter is built, and each placeholder template is parsed once into a render function,
+    e.g. ``formatter.param_placeholder(name, type, default)``. The ``start_*`` entries are kept as
+    plain strings. ``fingerprint`` identifies the templates, e.g. for keying cached docstrings.
+
+    Args:
+        definition (dict): the templates of the style
+        name (str): name of the style
+
+    Raises:
+        exc.InvalidFormatterError: If a template is missing or malformed
+    """
+
+    __slots__ = ("name", "fingerprint") + tuple(TEMPLATE_ARGUMENTS)
+
+    def __init__(self, definition, name=None):
+        self.name = name
+        try:
+            missing = [key for key in TEMPLATE_ARGUMENTS if key not in definition]
+        except TypeError:
+            raise exc.InvalidFormatterError(
+                "Formatter definition must be a dict, got {0!r}".format(definition)
+            )
+        if missing:
+            raise exc.InvalidFormatterError(
+                "Formatter {0!r} is missing: {1}".format(name, ", ".join(missing))
+            )
+        for key, arguments in TEMPLATE_ARGUMENTS.items():
+            template = definition[key]
+            if not isinstance(template, str):
+                raise exc.InvalidFormatterError(
+                    "Formatter {0!r} {1} must be a string".format(name, key)
+                )
+            if arguments:
+                template = _compile_template(name, key, template, arguments)
+            setattr(self, key, template)
+        self.fingerprint = hashlib.sha1(
+            "\0".join(definition[key] for key in TEMPLATE_ARGUMENTS).encode("utf-8")
+        ).hexdigest()
+
+    def __repr__(self):
+        return "Formatter({0!r})".format(self.name)
+
+
+def _compile_template(name, key, template, arguments):
+    """
+    Parse a ``str.format`` template into a function rendering it from positional arguments
+    """
+    literal_parts = []
+    indices = []
+    simple = True
+    try:
+        for literal, field, spec, conversion in _TemplateParser().parse(template):
+            literal_parts.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            if not field.isdigit() or int(field) >= arguments:
+                raise exc.InvalidFormatterError(
+                    "Formatter {0!r} {1} has unknown field {{{2}}}, use {{0}} to {{{3}}}".format(
+                        name, key, field, arguments - 1
+                    )
+                )
+            simple = simple and not spec and not conversion
+            literal_parts.append("%s")
+            indices.append(int(field))
+    except ValueError as ex:
+        raise exc.InvalidFormatterError(
+            "Formatter {0!r} {1} is not a valid template: {2}".format(name, key, ex)
+        )
+
+    if not simple:
+        # format specs and conversions need the full str.format machinery
+        return template.format
+    pattern = "".join(literal_parts)
+    if not indices:
+        return lambda *args: template
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda *args: pattern % (args[index],)
+    select = itemgetter(*indices)
+    return lambda *args: pattern % select(args)
+
+
+# styles registered with register_formatter
+_FORMATTERS = {}
+
+# name -> templates, formatter compiled from an entry of pydocstring.FORMATTER. Entries can be
+# added or edited at any time, so they are compiled again whenever their templates change
+_DEFINED_FORMATTERS = {}
+
+
+def register_formatter(name, definition):
+    """
+    Register a docstring style, so it can be selected by name
+
+    Args:
+        name (str): name to select the style with
+        definition (dict): the templates of the style, see :py:data:`pydocstring.FORMATTER`
+
+    Raises:
+        exc.InvalidFormatterError: If a template is missing or malformed
+
+    Returns:
+        Formatter: the compiled style
+    """
+    formatter = Formatter(definition, name)
+    _FORMATTERS[name] = formatter
+    return formatter
+
+
+def _defined_formatter(name):
+    """
+    Compile the entry of :py:data:`pydocstring.FORMATTER` for a name, or reuse the formatter
+    compiled from the same templates
+    """
+    definition = pydocstring.FORMATTER[name]
+    try:
+        templates = tuple(definition.get(key) for key in TEMPLATE_ARGUMENTS)
+    except AttributeError:
+        templates = None  # not a dict, Formatter raises the error
+    compiled = _DEFINED_FORMATTERS.get(name)
+    if compiled is not None and compiled[0] == templates:
+        return compiled[1]
+    formatter = Formatter(definition, name)
+    _DEFINED_FORMATTERS[name] = templates, formatter
+    return formatter
+
+
+def get_formatter(formatter):
+    """
+    Look up a docstring style
+
+    A name is looked up in the registered styles first, then in :py:data:`pydocstring.FORMATTER`,
+    whose entries may be added or edited at any time.
+
+    Args:
+        formatter (str or Formatter or dict): name of a registered style or an entry of
+            :py:data:`pydocstring.FORMATTER`, a formatter, or a style definition to compile
+
+    Raises:
+        exc.InvalidFormatterError: If there is no style with the given name, or the definition is
+            invalid
+
+    Returns:
+        Formatter: the style
+    """
+    if isinstance(formatter, Formatter):
+        return formatter
+    if isinstance(formatter, dict):
+        return Formatter(formatter)
+    try:
+        return _FORMATTERS[formatter]
+    except (KeyError, TypeError):
+        pass
+    try:
+        return _defined_formatter(formatter)
+    except (KeyError, TypeError):
+        raise exc.InvalidFormatterError(
+            "Unknown formatter {0!r}, choose from {1}".format(
+                formatter, ", ".join(sorted(set(_FORMATTERS) | set(pydocstring.FORMATTER)))
+            )
+        )
 
 
 def function_docstring(parso_function, formatter):
@@ -24,63 +200,68 @@ def function_docstring(parso_function, formatter):
     Format a google docstring for a function
 
     Args:
-        parso_function (Function): The function tree node
+        parso_function (Function): The function tree node, a scope object from
+            :py:mod:`pydocstring.backends` or a :py:class:`pydocstring.ir.ScopeInfo`
 
     Returns:
         str: The formatted docstring
     """
-    assert isinstance(parso_function, Function)
+    return "".join(iter_function_docstring(parso_function, formatter))
+
+
+def iter_function_docstring(parso_function, formatter):
+    """
+    Generate the fragments of a function docstring, in order
 
-    docstring = "\n"
+    Args:
+        parso_function (Function): The function tree node, a scope object from
+            :py:mod:`pydocstring.backends` or a :py:class:`pydocstring.ir.ScopeInfo`
+
+    Yields:
+        str: fragments of the formatted docstring
+    """
+    function = extract_scope(parso_function)
+    assert function.type == "funcdef"
+    formatter = get_formatter(formatter)
 
-    params = parso_function.get_params()
+    yield "\n"
+
+    params = function.params
     if params:
-        docstring += formatter["start_args_block"]
-        for param in params:
-            if param.star_count == 1:
-                docstring += formatter["param_placeholder_args"].format(
-                    param.name.value, "Variable length argument list."
-                )
-            elif param.star_count == 2:
-                docstring += formatter["param_placeholder_kwargs"].format(
-                    param.name.value, "Arbitrary keyword arguments."
-                )
+        yield formatter.start_args_block
+        param_placeholder = formatter.param_placeholder
+        for star_count, name, param_type, default in params:
+            if star_count == 1:
+                yield formatter.param_placeholder_args(name, "Variable length argument list.")
+            elif star_count == 2:
+                yield formatter.param_placeholder_kwargs(name, "Arbitrary keyword arguments.")
             else:
-                docstring += formatter["param_placeholder"].format(
-                    *get_param_info(param)
-                )
+                yield param_placeholder(name, param_type, default)
 
-    returns = list(parso_function.iter_return_stmts())
-    if returns:
-        docstring += formatter["start_return_block"]
-        for ret in returns:
-            docstring += formatter["return_placeholder"].format(
-                *get_return_info(ret, parso_function.annotation)
-            )
-    elif parso_function.annotation:
-        docstring += formatter["start_return_block"]
-        docstring += formatter["return_annotation_placeholder"].format(
-            parso_function.annotation.value
-        )
+    if function.returns:
+        yield formatter.start_return_block
+        return_placeholder = formatter.return_placeholder
+        for ret in function.returns:
+            yield return_placeholder(*ret)
+    elif function.return_annotation:
+        yield formatter.start_return_block
+        yield formatter.return_annotation_placeholder(function.return_annotation)
 
-    yields = list(parso_function.iter_yield_exprs())
+    yields = function.yields
     if yields:
-        docstring += formatter["start_yield_block"]
+        yield formatter.start_yield_block
+        yield_placeholder = formatter.yield_placeholder
         for yie in yields:
-            docstring += formatter["yield_placeholder"].format(
-                *get_return_info(yie, parso_function.annotation)
-            )
+            yield yield_placeholder(*yie)
 
-    raises = list(parso_function.iter_raise_stmts())
+    raises = function.raises
     if raises:
-        docstring += formatter["start_raise_block"]
+        yield formatter.start_raise_block
+        raise_placeholder = formatter.raise_placeholder
         for exception in raises:
-            docstring += formatter["raise_placeholder"].format(
-                get_exception_name(exception)
-            )
+            yield raise_placeholder(*exception)
 
-    docstring += "\n"
-    return docstring
+    yield "\n"
 
 
 def class_docstring(parso_class, formatter):
@@ -90,35 +271,38 @@ def class_docstring(parso_class, formatter):
     Only documents attributes, ``__init__`` method args can be documented on the ``__init__`` method
 
     Args:
-        parso_class (Class): The class tree node
+        parso_class (Class): The class tree node, a scope object from
+            :py:mod:`pydocstring.backends` or a :py:class:`pydocstring.ir.ScopeInfo`
 
     Returns:
         str: The formatted docstring
 
     """
-    assert isinstance(parso_class, Class)
-    docstring = "\n"
-    attribute_expressions = []
+    return "".join(iter_class_docstring(parso_class, formatter))
 
-    for child in parso_class.children:
-        if child.type == "suite":
-            for child2 in child.children:
-                if child2.type == "simple_stmt":
-                    for child3 in child2.children:
-                        if child3.type == "expr_stmt":
-                            attribute_expressions.append(child3)
 
-    if attribute_expressions:
-        docstring += formatter["start_attributes"]
-        for attribute in attribute_expressions:
-            name = attribute.children[0].value
-            code = attribute.get_rhs().get_code().strip()
-            attr_type = safe_determine_type(code)
-            attr_str = formatter["attribute_placeholder"].format(name, attr_type, code)
-            docstring += attr_str
+def iter_class_docstring(parso_class, formatter):
+    """
+    Generate the fragments of a class docstring, in order
+
+    Args:
+        parso_class (Class): The class tree node, a scope object from
+            :py:mod:`pydocstring.backends` or a :py:class:`pydocstring.ir.ScopeInfo`
 
-    docstring += "\n"
-    return docstring
+    Yields:
+        str: fragments of the formatted docstring
+    """
+    scope = extract_scope(parso_class)
+    assert scope.type == "classdef"
+    formatter = get_formatter(formatter)
+
+    yield "\n"
+    if scope.attributes:
+        yield formatter.start_attributes
+        attribute_placeholder = formatter.attribute_placeholder
+        for attribute in scope.attributes:
+            yield attribute_placeholder(*attribute)
+    yield "\n"
 
 
 def module_docstring(parso_module, formatter):
@@ -128,32 +312,54 @@ def module_docstring(parso_module, formatter):
     Only documents attributes, ``__init__`` method args can be documented on the ``__init__`` method
 
     Args:
-        parso_module (Module): The module tree node
+        parso_module (Module): The module tree node, a scope object from
+            :py:mod:`pydocstring.backends` or a :py:class:`pydocstring.ir.ScopeInfo`
 
     Returns:
         str: The formatted docstring
 
     """
-    assert isinstance(parso_module, Module)
-    docstring = "\n"
-    attribute_expressions = []
-
-    for child in parso_module.children:
-        if child.type == "simple_stmt":
-            for child2 in child.children:
-                if child2.type == "expr_stmt":
-                    attribute_expressions.append(child2)
-
-    if attribute_expressions:
-        docstring += formatter["start_attributes"]
-        for attribute in attribute_expressions:
-            name = attribute.children[0].value
-            code = attribute.get_rhs().get_code().strip()
-            attr_type = safe_determine_type(code)
-            attr_str = formatter["attribute_placeholder"].format(name, attr_type, code)
-            docstring += attr_str
-
-    docstring += "\n"
-    if not docstring.strip():
-        docstring = "\n\nEmpty Module\n\n"
-    return docstring
+    return "".join(iter_module_docstring(parso_module, formatter))
+
+
+def write_module_docstring(parso_module, formatter, stream):
+    """
+    Write a module docstring to a file-like object as it is formatted
+
+    Large modules can be documented without building the whole docstring in memory.
+
+    Args:
+        parso_module (Module): The module tree node, a scope object from
+            :py:mod:`pydocstring.backends` or a :py:class:`pydocstring.ir.ScopeInfo`
+        stream (file): object with a ``write`` method to write the docstring to
+    """
+    write = stream.write
+    for fragment in iter_module_docstring(parso_module, formatter):
+        write(fragment)
+
+
+def iter_module_docstring(parso_module, formatter):
+    """
+    Generate the fragments of a module docstring, in order
+
+    Args:
+        parso_module (Module): The module tree node, a scope object from
+            :py:mod:`pydocstring.backends` or a :py:class:`pydocstring.ir.ScopeInfo`
+
+    Yields:
+        str: fragments of the formatted docstring
+    """
+    scope = extract_scope(parso_module)
+    assert scope.type == "file_input"
+    formatter = get_formatter(formatter)
+
+    if not scope.attributes:
+        yield "\n\nEmpty Module\n\n"
+        return
+
+    yield "\n"
+    yield formatter.start_attributes
+    attribute_placeholder = formatter.attribute_placeholder
+    for attribute in scope.attributes:
+        yield attribute_placeholder(*attribute)
+    yield "\n"
@@ -0,0 +1,161 @@
+"""
+Intermediate representation of a scope, everything its docstring is rendered from
+
+:py:func:`extract_scope` reads a module, class or function once, from either backend in
+:py:mod:`pydocstring.backends`, into a :py:class:`ScopeInfo` of plain records. The formatters
+render from a :py:class:`ScopeInfo`, so the same scope can be rendered in any number of styles
+without reading the tree again, and the records are small enough to cache, e.g. in a
+:py:class:`pydocstring.diskcache.DiskCache`.
+
+The records are named tuples, they serialize to JSON lists and back with
+:py:func:`load_scope`.
+"""
+
+from collections import namedtuple
+
+from pydocstring.backends import as_scope
+
+Param = namedtuple("Param", ("star_count", "name", "type", "default"))
+Param.__doc__ = """
+A parameter of a function
+
+Attributes:
+    star_count (int): ``1`` for ``*args``, ``2`` for ``**kwargs``, else ``0``
+    name (str): name of the parameter
+    type (str or None): annotation or inferred type, None for ``*args`` and ``**kwargs``
+    default (str or None): the rendered default, ``""`` without one, None for ``*args`` and
+        ``**kwargs``
+"""
+
+Return = namedtuple("Return", ("type", "expression"))
+Return.__doc__ = """
+A return statement or yield expression of a function
+
+Attributes:
+    type (str): the return annotation of the function, or ``TYPE``
+    expression (str): the returned or yielded expression
+"""
+
+Raise = namedtuple("Raise", ("exception",))
+Raise.__doc__ = """
+A raise statement of a function
+
+Attributes:
+    exception (str): name of the exception raised
+"""
+
+Attribute = namedtuple("Attribute", ("name", "type", "value"))
+Attribute.__doc__ = """
+An attribute assigned in the body of a class or module
+
+Attributes:
+    name (str): name of the attribute
+    type (str): the inferred type of the value
+    value (str): the code of the value
+"""
+
+ScopeInfo = namedtuple(
+    "ScopeInfo",
+    (
+        "type",
+        "name",
+        "start_pos",
+        "end_pos",
+        "params",
+        "return_annotation",
+        "returns",
+        "yields",
+        "raises",
+        "attributes",
+    ),
+)
+ScopeInfo.__doc__ = """
+Everything the docstring of a scope is rendered from
+
+Attributes:
+    type (str): ``file_input``, ``classdef`` or ``funcdef``
+    name (str or None): name of the class or function, None for the module
+    start_pos (tuple): row, column the scope starts at
+    end_pos (tuple): row, column the scope ends at
+    params (list): a :py:class:`Param` for each parameter of a function
+    return_annotation (str or None): the return annotation of a function
+    returns (list): a :py:class:`Return` for each return statement of a function
+    yields (list): a :py:class:`Return` for each yield expression of a function
+    raises (list): a :py:class:`Raise` for each raise statement of a function
+    attributes (list): an :py:class:`Attribute` for each attribute of a class or module
+"""
+
+
+def extract_scope(scope):
+    """
+    Read the information a docstring is rendered from out of a scope
+
+    Args:
+        scope (BaseNode): ``file_input``, ``classdef`` or ``funcdef`` node, a scope object from
+            :py:mod:`pydocstring.backends`, or a :py:class:`ScopeInfo`, which is returned as is
+
+    Returns:
+        ScopeInfo: the information of the scope
+    """
+    if isinstance(scope, ScopeInfo):
+        return scope
+    scope = as_scope(scope)
+    params, returns, yields, raises, attributes = [], [], [], [], []
+    return_annotation = None
+    if scope.type == "funcdef":
+        params = [Param(*param) for param in scope.params()]
+        return_annotation = scope.return_annotation()
+        returns, yields, raises = scope.flow_statements()
+        returns = [Return(*ret) for ret in returns]
+        yields = [Return(*yie) for yie in yields]
+        raises = [Raise(exception) for exception in raises]
+    else:
+        attributes = [Attribute(*attribute) for attribute in scope.attributes()]
+    return ScopeInfo(
+        scope.type,
+        scope.name,
+        scope.start_pos,
+        scope.end_pos,
+        params,
+        return_annotation,
+        returns,
+        yields,
+        raises,
+        attributes,
+    )
+
+
+def load_scope(data):
+    """
+    Rebuild a :py:class:`ScopeInfo` from its JSON form, e.g. ``json.loads(json.dumps(info))``
+
+    Args:
+        data (list): the scope information as nested lists
+
+    Returns:
+        ScopeInfo: the scope information
+    """
+    (
+        scope_type,
+        name,
+        start_pos,
+        end_pos,
+        params,
+        return_annotation,
+        returns,
+        yields,
+        raises,
+        attributes,
+    ) = data
+    return ScopeInfo(
+        scope_type,
+        name,
+        tuple(start_pos),
+        tuple(end_pos),
+        [Param(*param) for param in params],
+        return_annotation,
+        [Return(*ret) for ret in returns],
+        [Return(*yie) for yie in yields],
+        [Raise(*exception) for exception in raises],
+        [Attribute(*attribute) for attribute in attributes],
+    )
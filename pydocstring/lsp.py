@@ -0,0 +1,331 @@
+"""
+Language Server Protocol server, started with ``pydocstring-lsp``
+
+Speaks LSP over stdio, so any editor with an LSP client gets docstrings from one long lived
+process. Each open document is kept as a :py:class:`pydocstring.session.DocstringSession`,
+updated with incremental ``textDocument/didChange`` edits and re-parsed through parso's diff
+parser only when a docstring is asked for.
+
+The server provides:
+
+- completion, triggered by typing the opening ``\"\"\"`` of a docstring, that inserts the
+  docstring for the enclosing scope and its closing quotes
+- a ``Generate docstring`` code action for the module, class or function at the cursor, when it
+  doesn't already have a docstring
+
+The docstring format is picked with the ``formatter`` initialization option, ``google``,
+``numpy`` or ``reST``, defaulting to ``google``.
+"""
+
+import json
+import sys
+
+from pydocstring.backends import ParsoScope
+from pydocstring.formatter import get_formatter
+from pydocstring.rewrite import docstring_insertion, indent_docstring
+from pydocstring.scopes import format_scope
+from pydocstring.session import DocstringSession
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+# LSP enumerations
+_SYNC_INCREMENTAL = 2
+_COMPLETION_SNIPPET = 15
+_INSERT_TEXT_PLAIN = 1
+_INSERT_AS_IS = 1
+
+_QUOTES = ('"""', "'''")
+
+
+def read_message(stream):
+    """
+    Read one message, framed by a ``Content-Length`` header
+
+    Args:
+        stream (file): binary stream to read from
+
+    Returns:
+        dict or None: the decoded message, or None at the end of the stream
+    """
+    length = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            if length is None:
+                continue
+            break
+        name, _, value = header.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    return json.loads(body.decode("utf-8"))
+
+
+def write_message(stream, message):
+    """
+    Write one message, framed by a ``Content-Length`` header
+
+    Args:
+        stream (file): binary stream to write to
+        message (dict): the message to encode
+    """
+    body = json.dumps(message).encode("utf-8")
+    stream.write("Content-Length: {0}\r\n\r\n".format(len(body)).encode("ascii") + body)
+    stream.flush()
+
+
+class LanguageServer(object):
+    """
+    A language server answering requests from `infile` until the client exits
+
+    Args:
+        infile (file): binary stream to read messages from, default: stdin
+        outfile (file): binary stream to write messages to, default: stdout
+        formatter (str): the format of the docstring choose from google, numpy, reST, unless the
+            client picks one in its initialization options
+    """
+
+    def __init__(self, infile=None, outfile=None, formatter="google"):
+        self.infile = infile or sys.stdin.buffer
+        self.outfile = outfile or sys.stdout.buffer
+        self.formatter = get_formatter(formatter)
+        # uri -> DocstringSession of each open document
+        self.documents = {}
+        self._shutdown = False
+        self._requests = {
+            "initialize": self.initialize,
+            "shutdown": self.shutdown,
+            "textDocument/completion": self.completion,
+            "textDocument/codeAction": self.code_action,
+        }
+        self._notifications = {
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didClose": self.did_close,
+        }
+
+    def serve(self):
+        """
+        Answer messages until the client sends ``exit`` or closes the stream
+
+        Returns:
+            int: the exit code, 0 if the client shut the server down first
+        """
+        while True:
+            try:
+                message = read_message(self.infile)
+            except ValueError as ex:
+                self._error(None, PARSE_ERROR, repr(ex))
+                continue
+            if message is None or message.get("method") == "exit":
+                return 0 if self._shutdown else 1
+            self.handle(message)
+
+    def handle(self, message):
+        """
+        Answer a single decoded message, writing the response if it's a request
+
+        Args:
+            message (dict): the decoded message
+        """
+        method = message.get("method")
+        params = message.get("params") or {}
+        if "id" not in message:
+            handler = self._notifications.get(method)
+            if handler is not None:
+                try:
+                    handler(params)
+                except Exception as ex:
+                    self._notify_error(method, ex)
+            return
+
+        request_id = message["id"]
+        handler = self._requests.get(method)
+        if handler is None:
+            self._error(request_id, METHOD_NOT_FOUND, "Unknown method {0}".format(method))
+        elif self._shutdown:
+            self._error(request_id, INVALID_REQUEST, "The server is shutting down")
+        else:
+            try:
+                result = handler(params)
+            except Exception as ex:
+                self._error(request_id, INTERNAL_ERROR, repr(ex))
+            else:
+                write_message(self.outfile, {"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def initialize(self, params):
+        """
+        ``initialize`` request, picks the formatter and advertises what the server provides
+        """
+        options = params.get("initializationOptions") or {}
+        if options.get("formatter"):
+            self.formatter = get_formatter(options["formatter"])
+        return {
+            "capabilities": {
+                "textDocumentSync": {"openClose": True, "change": _SYNC_INCREMENTAL},
+                "completionProvider": {"triggerCharacters": ['"', "'"]},
+                "codeActionProvider": True,
+            },
+            "serverInfo": {"name": "pydocstring"},
+        }
+
+    def shutdown(self, params):
+        """
+        ``shutdown`` request, after which only ``exit`` is accepted
+        """
+        self._shutdown = True
+        self.documents.clear()
+        return None
+
+    def did_open(self, params):
+        """
+        ``textDocument/didOpen`` notification, starts tracking the document
+        """
+        document = params["textDocument"]
+        self.documents[document["uri"]] = DocstringSession(document["text"])
+
+    def did_change(self, params):
+        """
+        ``textDocument/didChange`` notification, applies the edits to the document in order
+        """
+        session = self.documents[params["textDocument"]["uri"]]
+        for change in params["contentChanges"]:
+            if "range" in change:
+                lines = session.lines
+                session.edit(
+                    _from_lsp(lines, change["range"]["start"]),
+                    _from_lsp(lines, change["range"]["end"]),
+                    change["text"],
+                )
+            else:
+                session.set_source(change["text"])
+
+    def did_close(self, params):
+        """
+        ``textDocument/didClose`` notification, stops tracking the document
+        """
+        self.documents.pop(params["textDocument"]["uri"], None)
+
+    def completion(self, params):
+        """
+        ``textDocument/completion`` request, offers the docstring when the cursor follows the
+        opening quotes of one
+        """
+        session = self.documents[params["textDocument"]["uri"]]
+        row, column = _from_lsp(session.lines, params["position"])
+        line = session.lines[row - 1]
+        quotes = line[max(column - 3, 0) : column]
+        if quotes not in _QUOTES:
+            return []
+        # quotes the editor closed automatically would otherwise open a string running over the
+        # rest of the body
+        closed = line.startswith(quotes, column)
+        docstring = session.generate_docstring(
+            (row, column), formatter=self.formatter, autocomplete=True, closing_quotes=closed
+        )
+        indent = _indent_of(line)
+        end = column + 3 if closed else column
+        return [
+            {
+                "label": "Generate docstring",
+                "kind": _COMPLETION_SNIPPET,
+                "insertTextFormat": _INSERT_TEXT_PLAIN,
+                "insertTextMode": _INSERT_AS_IS,
+                "textEdit": {
+                    "range": {
+                        "start": _to_lsp(line, row, column),
+                        "end": _to_lsp(line, row, end),
+                    },
+                    "newText": indent_docstring(docstring, indent) + indent + quotes,
+                },
+            }
+        ]
+
+    def code_action(self, params):
+        """
+        ``textDocument/codeAction`` request, offers to insert the docstring of the scope at the
+        start of the range
+        """
+        uri = params["textDocument"]["uri"]
+        session = self.documents[uri]
+        scope = session.find_scope(_from_lsp(session.lines, params["range"]["start"]))
+        if scope.get_doc_node() is not None:
+            return []
+        start = ParsoScope(scope).body_start()
+        if start is None:
+            return []  # there's no line to insert before
+        row, column = start
+        text = docstring_insertion(
+            format_scope(scope, self.formatter), session.lines[row - 1][:column]
+        )
+        if text is None:
+            return []
+        position = {"line": row - 1, "character": 0}
+        edit = {"range": {"start": position, "end": position}, "newText": text}
+        return [
+            {
+                "title": "Generate docstring",
+                "kind": "refactor.rewrite",
+                "edit": {"changes": {uri: [edit]}},
+            }
+        ]
+
+    def _error(self, request_id, code, message):
+        write_message(
+            self.outfile,
+            {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}},
+        )
+
+    def _notify_error(self, method, ex):
+        write_message(
+            self.outfile,
+            {
+                "jsonrpc": "2.0",
+                "method": "window/logMessage",
+                "params": {"type": 1, "message": "{0} failed: {1!r}".format(method, ex)},
+            },
+        )
+
+
+def _from_lsp(lines, position):
+    """
+    Convert an LSP position, zero based line and UTF-16 offset, to a row, column tuple
+    """
+    row = position["line"] + 1
+    if row > len(lines):
+        return len(lines), len(lines[-1])
+    line = lines[row - 1].rstrip("\r\n")
+    units = position["character"]
+    head = line[:units]
+    if not head or max(head) <= "\uffff":
+        return row, len(head)
+    # characters outside the BMP are two UTF-16 code units
+    column = 0
+    for character in line:
+        units -= 2 if character > "\uffff" else 1
+        if units < 0:
+            break
+        column += 1
+    return row, column
+
+
+def _to_lsp(line, row, column):
+    """
+    Convert a row, column in a line to an LSP position
+    """
+    character = column + sum(1 for c in line[:column] if c > "\uffff")
+    return {"line": row - 1, "character": character}
+
+
+def _indent_of(line):
+    return line[: len(line) - len(line.lstrip(" \t"))]
+
@@ -0,0 +1,195 @@
+"""
+In place docstring insertion, used by ``pydocstring --write``
+
+Every class and function without a docstring gets one, inserted before the first statement of
+its body with the indentation of that statement, as does every module with attributes to
+document, the rest would only get the ``Empty Module`` placeholder. The file is parsed once: all the
+insertions are worked out against the positions of that one parse, then spliced into the text in
+a single pass and the file is replaced atomically, so an interrupted run never leaves a half
+written file behind.
+
+Only files that compile are rewritten, as parso's error recovery can't be trusted to place
+docstrings in a file that doesn't.
+"""
+
+import ast
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import tokenize
+from io import BytesIO
+
+import parso
+from parso.utils import split_lines
+
+from pydocstring.backends import ParsoScope, iter_ast_scopes
+from pydocstring.formatter import get_formatter
+from pydocstring.scopes import ScopeFilter, format_scope, iter_scopes
+
+
+def insert_docstrings(source, formatter="google", public=False, names=None):
+    """
+    Insert a docstring into every scope of the source that doesn't have one
+
+    Args:
+        source (str): the text of the source
+        formatter (str or Formatter): the format of the docstring choose from google, numpy,
+            reST, or a style registered with :py:func:`pydocstring.register_formatter`.
+        public (bool): only insert into public scopes, see
+            :py:class:`pydocstring.scopes.ScopeFilter`. default: False
+        names (list): only insert into the classes and functions matching one of these glob
+            patterns, see :py:class:`pydocstring.scopes.ScopeFilter`. default: None
+
+    Raises:
+        SyntaxError: If the source doesn't compile
+        exc.InvalidFormatterError: If the value provided to `formatter` is not a supported
+            formatter name
+
+    Returns:
+        str: the source with the docstrings inserted, `source` itself if there was nothing to
+        insert
+    """
+    formatter = get_formatter(formatter)
+    scope_filter = ScopeFilter(undocumented=True, public=public, names=names)
+    lines = split_lines(source, keepends=True)
+    insertions = []
+    for scope in _iter_compiled_scopes(source, scope_filter):
+        start = scope.body_start()
+        if start is None:
+            continue
+        if scope.type == "file_input" and next(iter(scope.attributes()), None) is None:
+            continue
+        row, column = start
+        line = lines[row - 1]
+        newline = line[len(line.rstrip("\r\n")) :] or "\n"
+        text = docstring_insertion(format_scope(scope, formatter), line[:column], newline)
+        if text is not None:
+            insertions.append((row, text))
+    if not insertions:
+        return source
+
+    # every row is from the one parse of the original text, so splice in row order, each piece
+    # of the original once
+    insertions.sort(key=lambda insertion: insertion[0])
+    pieces = []
+    previous = 0
+    for row, text in insertions:
+        pieces.extend(lines[previous : row - 1])
+        pieces.append(text)
+        previous = row - 1
+    pieces.extend(lines[previous:])
+    return "".join(pieces)
+
+
+def write_docstrings(path, formatter="google", public=False, names=None):
+    """
+    Insert a docstring into every scope of a file that doesn't have one
+
+    The file keeps its encoding and line endings, and is only replaced if something was
+    inserted.
+
+    Args:
+        path (str): path of the file
+        formatter (str or Formatter): the format of the docstring choose from google, numpy,
+            reST, or a style registered with :py:func:`pydocstring.register_formatter`.
+        public (bool): only insert into public scopes. default: False
+        names (list): only insert into the classes and functions matching one of these glob
+            patterns. default: None
+
+    Raises:
+        SyntaxError: If the file doesn't compile
+        exc.InvalidFormatterError: If the value provided to `formatter` is not a supported
+            formatter name
+
+    Returns:
+        bool: whether the file was changed
+    """
+    with open(path, "rb") as source_file:
+        data = source_file.read()
+    encoding = tokenize.detect_encoding(BytesIO(data).readline)[0]
+    source = data.decode(encoding)
+    rewritten = insert_docstrings(source, formatter, public, names)
+    if rewritten is source:
+        return False
+    _replace_file(path, rewritten.encode(encoding))
+    return True
+
+
+def docstring_insertion(docstring, indent, newline="\n"):
+    """
+    The lines to insert for a docstring, quoted and indented as the statement it goes before
+
+    Args:
+        docstring (str): the docstring, excluding quotation marks
+        indent (str): the indentation of the statement the docstring goes before
+        newline (str): the line ending of the source. default: ``"\\n"``
+
+    Returns:
+        str or None: the docstring lines, or None if the docstring can't be quoted, as it
+        contains both kinds of triple quotes
+    """
+    if '"""' not in docstring:
+        quotes = '"""'
+    elif "'''" not in docstring:
+        quotes = "'''"
+    else:
+        return None
+    prefix = "r" if "\\" in docstring else ""
+    lines = "{0}{1}{2}{3}{0}{2}\n".format(
+        indent, prefix, quotes, indent_docstring(docstring, indent)
+    )
+    return lines.replace("\n", newline) if newline != "\n" else lines
+
+
+def indent_docstring(docstring, indent):
+    """
+    Indent every line of the docstring but the first, which follows the opening quotes
+
+    Those lines are dedented first, as some styles, e.g. numpy, indent their sections already.
+
+    Args:
+        docstring (str): the docstring, excluding quotation marks
+        indent (str): the indentation to add
+
+    Returns:
+        str: the indented docstring
+    """
+    first, newline, rest = docstring.partition("\n")
+    lines = textwrap.dedent(rest).split("\n")
+    return first + newline + "\n".join(indent + line if line else line for line in lines)
+
+
+def _iter_compiled_scopes(source, scope_filter):
+    """
+    The scopes of source that compiles, read with :py:mod:`ast` where it has end positions
+    """
+    try:
+        return iter_ast_scopes(source, scope_filter)
+    except SyntaxError:
+        if sys.version_info >= (3, 8):
+            raise
+    compile(source, "<unknown>", "exec", ast.PyCF_ONLY_AST)
+    return (ParsoScope(scope) for scope in iter_scopes(parso.parse(source), scope_filter))
+
+
+def _replace_file(path, data):
+    """
+    Replace the contents of a file atomically, keeping its permissions
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(prefix="." + name + ".", dir=directory)
+    try:
+        with os.fdopen(descriptor, "wb") as temporary_file:
+            temporary_file.write(data)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        shutil.copymode(path, temporary_path)
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.unlink(temporary_path)
+        except OSError:
+            pass
+        raise
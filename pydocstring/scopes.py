@@ -0,0 +1,319 @@
+"""
+Helpers for finding the scopes (modules, classes and functions) docstrings are generated for
+"""
+
+from bisect import bisect_left
+from collections import namedtuple
+from fnmatch import fnmatchcase
+from functools import partial
+
+from parso.python.tree import BaseNode, search_ancestor
+
+import pydocstring.formatter
+from pydocstring import exc
+from pydocstring.ir import extract_scope
+
+SCOPE_TYPES = ("classdef", "funcdef", "file_input")
+
+ScopeDocstring = namedtuple(
+    "ScopeDocstring", ("scope_type", "name", "start_pos", "end_pos", "docstring")
+)
+ScopeDocstring.__doc__ = """
+A docstring generated for one scope of a module
+
+Attributes:
+    scope_type (str): ``file_input``, ``classdef`` or ``funcdef``
+    name (str or None): name of the class or function, None for the module
+    start_pos (tuple): row, column the scope starts at
+    end_pos (tuple): row, column the scope ends at
+    docstring (str): the generated docstring, excluding quotation marks
+"""
+
+
+class ScopeFilter(object):
+    """
+    Which scopes to generate docstrings for, checked as the tree is walked
+
+    The walks in :py:func:`iter_scopes` and :py:mod:`pydocstring.backends` ask the filter about
+    each scope before reading anything else from it, and don't descend into scopes whose nested
+    scopes can't pass.
+
+    Args:
+        undocumented (bool): only scopes without a docstring. default: False
+        public (bool): only the module, and the classes and functions whose name doesn't start
+            with an underscore (``__magic__`` names are public) that are not nested in a private
+            class or in a function. default: False
+        names (list): glob patterns, only classes and functions whose name, e.g. ``test_*``, or
+            dotted path from the module, e.g. ``Class.*``, matches one of them. The module is
+            left out. default: None, any name
+    """
+
+    __slots__ = ("undocumented", "public", "names")
+
+    def __init__(self, undocumented=False, public=False, names=None):
+        self.undocumented = undocumented
+        self.public = public
+        self.names = list(names) if names is not None else None
+
+    def __repr__(self):
+        return "ScopeFilter(undocumented={0!r}, public={1!r}, names={2!r})".format(
+            self.undocumented, self.public, self.names
+        )
+
+    def accepts(self, scope_type, path, has_docstring):
+        """
+        Whether to generate a docstring for a scope
+
+        Args:
+            scope_type (str): ``file_input``, ``classdef`` or ``funcdef``
+            path (tuple): names of the enclosing classes and functions and of the scope, empty
+                for the module
+            has_docstring (callable): called without arguments, returns whether the scope has a
+                docstring. Only called if the names pass
+
+        Returns:
+            bool: True if the scope passes the filter
+        """
+        if path:
+            if self.public and not _is_public(path[-1]):
+                return False
+            if self.names is not None:
+                dotted = ".".join(path)
+                if not any(
+                    fnmatchcase(path[-1], pattern) or fnmatchcase(dotted, pattern)
+                    for pattern in self.names
+                ):
+                    return False
+        elif self.names is not None:
+            return False
+        return not (self.undocumented and has_docstring())
+
+    def descends(self, scope_type, path):
+        """
+        Whether any scope nested in a scope can pass the filter
+
+        Args:
+            scope_type (str): ``file_input``, ``classdef`` or ``funcdef``
+            path (tuple): names of the enclosing classes and functions and of the scope
+
+        Returns:
+            bool: False if the nested scopes can all be skipped
+        """
+        if self.public and path:
+            return scope_type == "classdef" and _is_public(path[-1])
+        return True
+
+
+def _is_public(name):
+    return not name.startswith("_") or (name.startswith("__") and name.endswith("__"))
+
+
+def iter_scopes(tree, scope_filter=None):
+    """
+    Walk a parsed module once, yielding the module and every class and function in it
+
+    Scopes are yielded in source order, enclosing scopes before the scopes nested in them.
+
+    Args:
+        tree (Module): The parsed module
+        scope_filter (ScopeFilter): only yield the scopes that pass this filter. default: None
+
+    Yields:
+        BaseNode: the ``file_input``, ``classdef`` and ``funcdef`` nodes
+    """
+    if scope_filter is not None:
+        for node in _iter_filtered_scopes(tree, scope_filter):
+            yield node
+        return
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node.type in SCOPE_TYPES:
+            yield node
+        stack.extend(
+            child for child in reversed(node.children) if isinstance(child, BaseNode)
+        )
+
+
+def _has_docstring(node):
+    return node.get_doc_node() is not None
+
+
+def _iter_filtered_scopes(tree, scope_filter):
+    stack = [(tree, ())]
+    while stack:
+        node, path = stack.pop()
+        if node.type in SCOPE_TYPES:
+            if node.type != "file_input":
+                path += (node.name.value,)
+            if scope_filter.accepts(node.type, path, partial(_has_docstring, node)):
+                yield node
+            if not scope_filter.descends(node.type, path):
+                continue
+        stack.extend(
+            (child, path) for child in reversed(node.children) if isinstance(child, BaseNode)
+        )
+
+
+def find_scope(tree, position):
+    """
+    Find the innermost scope containing a position
+
+    Args:
+        tree (Module): The parsed module
+        position (tuple): row, column. Rows start at 1, columns start at 0
+
+    Raises:
+        exc.FailedToGenerateDocstringError: If no scope could be found
+
+    Returns:
+        BaseNode: the ``file_input``, ``classdef`` or ``funcdef`` node
+    """
+    try:
+        leaf = tree.get_leaf_for_position(position, include_prefixes=True)
+    except ValueError as e:
+        leaf = tree
+    if not leaf:  # pragma: no cover
+        raise exc.FailedToGenerateDocstringError(
+            "Could not find leaf at cursor position {}".format(position)
+        )
+    scope = search_ancestor(leaf, *SCOPE_TYPES)
+    if not scope:
+        if leaf.type == "file_input":
+            scope = leaf
+        else:  # pragma: no cover
+            raise exc.FailedToGenerateDocstringError(
+                "Could not find scope of leaf {} ".format(leaf)
+            )
+    return scope
+
+
+class ScopeIndex(object):
+    """
+    Sorted intervals of the classes and functions in a parsed module, for finding the scope of
+    many positions in the same tree
+
+    Built with one walk of the tree, after which :py:meth:`find` is a binary search. It finds the
+    same scope as :py:func:`find_scope`, and must be rebuilt when the tree changes.
+
+    Args:
+        tree (Module): The parsed module
+    """
+
+    __slots__ = ("tree", "_lows", "_highs", "_scopes", "_parents")
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._lows = []
+        self._highs = []
+        self._scopes = []
+        self._parents = []
+        # get_leaf_for_position picks the first leaf ending at or after the position, so a
+        # scope covers the positions after the end of the leaf before it, up to its own end
+        stack = [(tree, -1)]
+        while stack:
+            node, parent = stack.pop()
+            if node.type in ("classdef", "funcdef"):
+                previous_leaf = node.get_first_leaf().get_previous_leaf()
+                self._lows.append(previous_leaf.end_pos if previous_leaf else (1, -1))
+                self._highs.append(node.end_pos)
+                self._scopes.append(node)
+                self._parents.append(parent)
+                parent = len(self._scopes) - 1
+            stack.extend(
+                (child, parent)
+                for child in reversed(node.children)
+                if isinstance(child, BaseNode)
+            )
+
+    def __len__(self):
+        return len(self._scopes)
+
+    def find(self, position):
+        """
+        Find the innermost scope containing a position
+
+        Args:
+            position (tuple): row, column. Rows start at 1, columns start at 0
+
+        Returns:
+            BaseNode: the ``file_input``, ``classdef`` or ``funcdef`` node
+        """
+        return self._find(tuple(position), 0)[0]
+
+    def find_all(self, positions):
+        """
+        Find the innermost scope containing each of many positions
+
+        The positions are resolved in sorted order, so each binary search starts where the last
+        one finished.
+
+        Args:
+            positions (list): row, column tuples. Rows start at 1, columns start at 0
+
+        Returns:
+            list: the ``file_input``, ``classdef`` or ``funcdef`` node for each position, in the
+            order of `positions`
+        """
+        positions = [tuple(position) for position in positions]
+        scopes = [None] * len(positions)
+        lower = 0
+        for i in sorted(range(len(positions)), key=positions.__getitem__):
+            scopes[i], lower = self._find(positions[i], lower)
+        return scopes
+
+    def _find(self, position, lower):
+        if not (1, 0) <= position <= self.tree.end_pos:
+            return self.tree, lower
+        lower = bisect_left(self._lows, position, lower)
+        index = lower - 1
+        while index >= 0:
+            if position <= self._highs[index]:
+                return self._scopes[index], lower
+            index = self._parents[index]
+        return self.tree, lower
+
+
+def format_scope(scope, formatter):
+    """
+    Format the docstring for a scope
+
+    Args:
+        scope (BaseNode): ``file_input``, ``classdef`` or ``funcdef`` node, a scope object from
+            :py:mod:`pydocstring.backends` or a :py:class:`pydocstring.ir.ScopeInfo`
+        formatter (Formatter): the formatter to use
+
+    Raises:
+        exc.FailedToGenerateDocstringError: If the node is not a scope
+
+    Returns:
+        str: The formatted docstring
+    """
+    if scope.type == "classdef":
+        return pydocstring.formatter.class_docstring(scope, formatter)
+    elif scope.type == "funcdef":
+        return pydocstring.formatter.function_docstring(scope, formatter)
+    elif scope.type == "file_input":
+        return pydocstring.formatter.module_docstring(scope, formatter)
+
+    raise exc.FailedToGenerateDocstringError(
+        "Failed to generate Docstring for: {}".format(scope)
+    )  # pragma: no cover
+
+
+def scope_docstring(scope, formatter):
+    """
+    Format the docstring for a scope, along with where the scope is
+
+    Args:
+        scope (BaseNode): ``file_input``, ``classdef`` or ``funcdef`` node, a scope object from
+            :py:mod:`pydocstring.backends` or a :py:class:`pydocstring.ir.ScopeInfo`
+        formatter (Formatter): the formatter to use
+
+    Returns:
+        ScopeDocstring: the docstring and scope information
+    """
+    scope = extract_scope(scope)
+    return ScopeDocstring(
+        scope.type, scope.name, scope.start_pos, scope.end_pos, format_scope(scope, formatter)
+    )
@@ -0,0 +1,97 @@
+"""
+Persistent server mode for editor integrations, started with ``pydocstring --serve``
+
+The server reads newline delimited JSON requests from stdin and writes one JSON response line to
+stdout per request. It stays alive until stdin is closed, so the interpreter, parso's grammar and
+the parse cache stay warm between requests.
+
+A request is an object with the keys:
+
+- ``source``: the text of the buffer. May be omitted when ``buffer_id`` is given, in which case
+  the text last sent for that buffer is used
+- ``buffer_id``: (optional) identifies the editor buffer, enables incremental re-parsing
+- ``position``: (optional) ``[row, column]`` of the cursor, defaults to ``[1, 0]``
+- ``formatter``: (optional) ``google``, ``numpy`` or ``reST``, defaults to ``google``
+- ``autocomplete``: (optional) remove the three quotes before the position, defaults to false
+- ``timing``: (optional) if true, the response includes the time spent in each phase, see
+  :py:class:`pydocstring.timing.Timing`
+- ``id``: (optional) echoed back in the response
+
+A response is ``{"id": ..., "docstring": ...}`` or ``{"id": ..., "error": ...}``, with a
+``timing`` object if it was requested.
+"""
+
+import json
+import sys
+
+import pydocstring
+from pydocstring.cache import ParseCache
+
+
+def handle_request(request, cache):
+    """
+    Generate the docstring for a single decoded request
+
+    Args:
+        request (dict): The decoded request
+        cache (ParseCache): cache of parsed buffers
+
+    Raises:
+        ValueError: If the request has neither a source nor a known buffer_id
+
+    Returns:
+        dict: the response, without the request id
+    """
+    buffer_id = request.get("buffer_id")
+    source = request.get("source")
+    autocomplete = bool(request.get("autocomplete", False))
+    if source is None:
+        if buffer_id is None:
+            raise ValueError("A source or buffer_id is required")
+        source = cache.get_source(buffer_id)
+        if source is None:
+            raise ValueError("Unknown buffer_id {!r}".format(buffer_id))
+    timings = []
+    docstring = pydocstring.generate_docstring(
+        source,
+        position=tuple(request.get("position", (1, 0))),
+        formatter=request.get("formatter", "google"),
+        autocomplete=autocomplete,
+        buffer_id=buffer_id,
+        cache=cache,
+        on_timing=timings.append if request.get("timing") else None,
+    )
+    response = {"docstring": docstring}
+    if timings:
+        response["timing"] = dict(timings[0]._asdict())
+    return response
+
+
+def serve(infile=None, outfile=None, cache=None):
+    """
+    Answer requests from `infile` until it is closed
+
+    Args:
+        infile (file): stream to read requests from, default: stdin
+        outfile (file): stream to write responses to, default: stdout
+        cache (ParseCache): cache of parsed buffers, a new one is made if not given
+    """
+    infile = infile or sys.stdin
+    outfile = outfile or sys.stdout
+    cache = cache if cache is not None else ParseCache()
+
+    for line in infile:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            request_id = request.get("id")
+            response = {"id": request_id}
+            response.update(handle_request(request, cache))
+        except Exception as ex:
+            response = {"id": request_id, "error": repr(ex)}
+        outfile.write(json.dumps(response) + "\n")
+        outfile.flush()
@@ -0,0 +1,213 @@
+"""
+Long lived, editable documents for editor integrations
+
+A :py:class:`DocstringSession` holds the text of one buffer as a list of lines along with its
+parse tree. Editors send it text edits as the user types, rather than the whole buffer with every
+request, and it re-parses only when a docstring is asked for, through parso's diff parser.
+"""
+
+import threading
+
+import parso
+from parso.utils import split_lines
+
+from pydocstring.autocomplete import remove_quotes_from_lines
+from pydocstring.cache import reparse
+from pydocstring.formatter import get_formatter
+from pydocstring.ir import extract_scope
+from pydocstring.scopes import ScopeIndex, find_scope, format_scope
+
+
+class DocstringSession(object):
+    """
+    The text and parse tree of one buffer, kept up to date with edits
+
+    Positions are row, column tuples, rows start at 1 and columns start at 0, as for
+    :py:func:`pydocstring.generate_docstring`.
+
+    Args:
+        source (str): the initial text of the buffer
+        grammar (parso.Grammar): Grammar to parse with, defaults to parso's default grammar
+    """
+
+    def __init__(self, source="", grammar=None):
+        self.grammar = grammar or parso.load_grammar()
+        self._lock = threading.RLock()
+        # the current text, as ``split_lines(source, keepends=True)`` would give it
+        self._lines = split_lines(source, keepends=True)
+        # the tree and the lines it was parsed from. Edits never change these lines in place,
+        # so the tree is up to date exactly when the two line lists are the same object
+        self._tree = None
+        self._tree_lines = None
+        self._scope_index = None
+        self._queries = 0
+
+    @property
+    def source(self):
+        """
+        str: the current text of the buffer
+        """
+        return "".join(self._lines)
+
+    @property
+    def lines(self):
+        """
+        list: the lines of the buffer, including line endings. Don't modify it
+        """
+        return self._lines
+
+    @property
+    def tree(self):
+        """
+        Module: the parse tree of the current text, parsed if the buffer changed since last time
+        """
+        with self._lock:
+            return self._parse(self._lines)
+
+    def set_source(self, source):
+        """
+        Replace the whole text of the buffer
+
+        Args:
+            source (str): the new text
+        """
+        with self._lock:
+            self._lines = split_lines(source, keepends=True)
+
+    def edit(self, start, end, text):
+        """
+        Replace the text between two positions, like an LSP ``TextEdit``
+
+        Only the lines the edit touches are split again, and nothing is re-parsed until the next
+        query.
+
+        Args:
+            start (tuple): row, column where the replaced text starts
+            end (tuple): row, column where the replaced text ends
+            text (str): the new text
+
+        Raises:
+            ValueError: If the range is not within the buffer
+        """
+        with self._lock:
+            lines = self._lines
+            (start_row, start_column), (end_row, end_column) = start, end
+            if not 1 <= start_row <= end_row <= len(lines):
+                raise ValueError("Edit range {0} - {1} is outside the buffer".format(start, end))
+            if lines is self._tree_lines:
+                # keep the lines the tree was parsed from intact for the diff parser
+                lines = self._lines = list(lines)
+
+            first = start_row - 1
+            prefix = lines[first][:start_column]
+            if first and lines[first - 1].endswith("\r"):
+                # the text may start with a "\n" completing a "\r\n" line ending
+                first -= 1
+                prefix = lines[first] + prefix
+            replaced = split_lines(prefix + text + lines[end_row - 1][end_column:], keepends=True)
+            if end_row < len(lines):
+                # the last replaced line ended in a line break, so there is no partial last line
+                replaced.pop()
+            lines[first:end_row] = replaced
+
+    def generate_docstring(
+        self, position, formatter="google", autocomplete=False, closing_quotes=False
+    ):
+        """
+        Generate the docstring for the scope at a position in the buffer
+
+        Args:
+            position (tuple): the position of the cursor, row, column.
+            formatter (str or Formatter): the format of the docstring choose from google, numpy,
+                reST, or a style registered with :py:func:`pydocstring.register_formatter`.
+            autocomplete (bool): Whether or not to ignore the three characters before the
+                position, the \"\"\" before a docstring. The buffer itself is not changed.
+                default: False
+            closing_quotes (bool): With `autocomplete`, whether or not to also ignore the three
+                characters after the position, closing quotes the editor inserted along with the
+                opening ones. default: False
+
+        Raises:
+            exc.InvalidFormatterError: If the value provided to `formatter` is not a supported
+                formatter name
+
+        Returns:
+            str: docstring, excluding quotation marks
+        """
+        formatter = get_formatter(formatter)
+        with self._lock:
+            scope = self._scope_at(position, autocomplete, closing_quotes)
+            return format_scope(scope, formatter)
+
+    def generate_docstring_styles(
+        self, position, formatters=("google", "numpy", "reST"), autocomplete=False
+    ):
+        """
+        Generate the docstring for the scope at a position in the buffer in several styles, from
+        one parse
+
+        Args:
+            position (tuple): the position of the cursor, row, column.
+            formatters (list): the styles to render, names of registered styles or
+                :py:class:`pydocstring.formatter.Formatter` objects. default: google, numpy and
+                reST
+            autocomplete (bool): Whether or not to ignore the three characters before the
+                position, the \"\"\" before a docstring. default: False
+
+        Raises:
+            exc.InvalidFormatterError: If a value in `formatters` is not a supported formatter
+                name
+
+        Returns:
+            dict: the docstring, excluding quotation marks, keyed by the name of each style
+        """
+        formatters = [get_formatter(formatter) for formatter in formatters]
+        with self._lock:
+            scope = extract_scope(self._scope_at(position, autocomplete))
+        return {formatter.name: format_scope(scope, formatter) for formatter in formatters}
+
+    def find_scope(self, position):
+        """
+        Find the innermost scope containing a position in the current text
+
+        Args:
+            position (tuple): row, column. Rows start at 1, columns start at 0
+
+        Returns:
+            BaseNode: the ``file_input``, ``classdef`` or ``funcdef`` node
+        """
+        with self._lock:
+            return self._find_scope(self._parse(self._lines), position)
+
+    def _scope_at(self, position, autocomplete, closing_quotes=False):
+        lines = self._lines
+        if autocomplete:
+            lines = list(lines)
+            position = remove_quotes_from_lines(lines, position)
+            if closing_quotes:
+                row, column = position
+                line = lines[row - 1]
+                lines[row - 1] = line[:column] + line[column + 3 :]
+        return self._find_scope(self._parse(lines), position)
+
+    def _parse(self, lines):
+        if lines is self._tree_lines:
+            return self._tree
+        if self._tree is None:
+            self._tree = self.grammar.parse("".join(lines))
+            self._scope_index = None
+        elif lines != self._tree_lines:
+            self._tree = reparse(self.grammar, self._tree, self._tree_lines, lines)
+            self._scope_index = None
+            self._queries = 0
+        self._tree_lines = lines
+        return self._tree
+
+    def _find_scope(self, tree, position):
+        # as ParseCache, only index a tree that's queried more than once
+        if self._scope_index is None:
+            self._queries += 1
+            if self._queries < 2:
+                return find_scope(tree, position)
+            self._scope_index = ScopeIndex(tree)
+        return self._scope_index.find(position)
@@ -0,0 +1,43 @@
+"""
+Per-phase timing of docstring generation, see the ``on_timing`` argument of
+:py:func:`pydocstring.generate_docstring`
+"""
+
+from collections import namedtuple
+from time import perf_counter
+
+Timing = namedtuple(
+    "Timing", ("splice", "parse", "scope", "format", "source_size", "scope_type")
+)
+Timing.__doc__ = """
+Wall time spent in each phase of generating a docstring, in seconds
+
+Attributes:
+    splice (float): removing the quotes before the cursor, when autocompleting
+    parse (float): parsing the source (or re-parsing a cached buffer)
+    scope (float): finding the scope the cursor is in
+    format (float): formatting the docstring
+    source_size (int): length of the source
+    scope_type (str): ``file_input``, ``classdef`` or ``funcdef``
+"""
+
+
+def no_clock():
+    """
+    Stands in for the clock when timing is disabled
+    """
+    return 0.0
+
+
+def get_clock(on_timing):
+    """
+    Get the clock to time phases with
+
+    Args:
+        on_timing (callable or None): the timing callback
+
+    Returns:
+        callable: :py:func:`time.perf_counter` if there is a callback, else a clock that
+        always returns 0
+    """
+    return perf_counter if on_timing is not None else no_clock
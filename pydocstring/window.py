@@ -0,0 +1,127 @@
+"""
+Windowed parsing, for generating docstrings in very large files
+
+Rather than parsing the whole file, the top level ``def`` or ``class`` block the cursor is in is
+found from the indentation of the lines around it, and only that block is parsed. When the block
+can't be isolated with confidence (decorators, continuation lines, strings spanning the block
+boundaries, or the cursor outside a top level block) no window is returned, and the whole file
+should be parsed instead.
+"""
+
+import io
+import tokenize
+
+from pydocstring import WINDOW_THRESHOLD
+from pydocstring.autocomplete import remove_quotes
+
+_BLOCK_STARTS = ("def ", "class ", "async def ")
+
+
+def find_window(source, position, autocomplete=False):
+    """
+    Cut out the top level ``def`` or ``class`` block the cursor is in
+
+    Args:
+        source (str): the text of the source
+        position (tuple): row, column of the cursor
+        autocomplete (bool): Whether or not to remove the three characters before the position
+            from the block
+
+    Returns:
+        tuple or None: the source of the block and the position of the cursor within it, or None
+        if the block couldn't be isolated
+    """
+    if source.count("\r") != source.count("\r\n"):
+        return None  # rows are also split on a lone "\r", which the scan below doesn't do
+    row, column = position
+    cursor_line = _row_offset(source, row)
+    if cursor_line is None:
+        return None
+
+    # back from the cursor to the start of the block
+    start = cursor_line
+    start_row = row
+    while not _is_top_level_code(source, start):
+        if start == 0:
+            return None
+        start = source.rfind("\n", 0, start - 1) + 1
+        start_row -= 1
+    if not source.startswith(_BLOCK_STARTS, start):
+        return None
+
+    # decorators or a continuation line belong with the block, leave those to a full parse
+    previous = start
+    while previous:
+        previous = source.rfind("\n", 0, previous - 1) + 1
+        line = source[previous : source.find("\n", previous)].rstrip()
+        if line and not line.lstrip().startswith("#"):
+            if line.startswith("@") or line.endswith("\\"):
+                return None
+            break
+
+    # a def or class inside a string isn't a block. The triple quotes are only counted when no
+    # line with one could have it inside another string or a comment
+    if _ambiguous_triple_quotes(source, start):
+        return None
+    if source.count('"""', 0, start) % 2 or source.count("'''", 0, start) % 2:
+        return None
+
+    # forward from the cursor to the next top level code
+    end = source.find("\n", cursor_line)
+    while end != -1 and not _is_top_level_code(source, end + 1):
+        end = source.find("\n", end + 1)
+    window = source[start:] if end == -1 else source[start : end + 1]
+
+    position = (row - start_row + 1, column)
+    if autocomplete:
+        window, position = remove_quotes(window, position)
+    if not _tokenizes(window):
+        return None
+    return window, position
+
+
+def _row_offset(source, row):
+    offset = 0
+    for _ in range(row - 1):
+        offset = source.find("\n", offset) + 1
+        if not offset:
+            return None
+    return offset
+
+
+def _ambiguous_triple_quotes(source, end):
+    """
+    Whether a line before the offset has triple quotes along with another quote or a ``#``
+    """
+    for quotes in ('"""', "'''"):
+        offset = source.find(quotes, 0, end)
+        while offset != -1:
+            line_start = source.rfind("\n", 0, offset) + 1
+            line_end = source.find("\n", offset)
+            if line_end == -1:
+                line_end = len(source)
+            line = source[line_start:line_end].replace('"""', "").replace("'''", "")
+            if "'" in line or '"' in line or "#" in line:
+                return True
+            offset = source.find(quotes, line_end, end)
+    return False
+
+
+def _is_top_level_code(source, offset):
+    """
+    Whether the line starting at the offset is code that isn't indented
+    """
+    return offset < len(source) and source[offset] not in " \t\r\n\x0c#"
+
+
+def _tokenizes(window):
+    """
+    Whether the window is complete, without unterminated strings or brackets
+    """
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(window).readline):
+            if token.type == tokenize.ERRORTOKEN:
+                return False
+    except (tokenize.TokenError, SyntaxError):
+        return False
+    return True
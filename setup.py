@@ -39,11 +39,12 @@ setup(
     description='Package providing autocompletion capabilities for python docstrings',
     long_description=long_description,
     license='MIT',
-    packages=find_packages(exclude=('tests')),
+    packages=find_packages(exclude=('tests', 'tests.*', 'benchmarks', 'benchmarks.*')),
     classifiers=classifiers,
     entry_points={
         'console_scripts': [
             'pydocstring=pydocstring.cli:main',
+            'pydocstring-lsp=pydocstring.cli:lsp_main',
         ],
     },
     install_requires=[
@@ -0,0 +1,97 @@
+"""
+Test the asyncio API
+"""
+
+import asyncio
+import sys
+import threading
+import unittest
+from unittest import mock
+import pytest
+from pydocstring import scopes
+from pydocstring import AsyncDocstringGenerator, async_generate_docstring, generate_docstring
+
+SOURCE = "def method(p1):\n    return p1\n"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="Requires Python 3.7")
+class TestAsyncGenerateDocstring(unittest.TestCase):
+
+    def test_generate(self):
+        docstring = asyncio.run(async_generate_docstring(SOURCE, (1, 4), formatter="reST"))
+        assert docstring == generate_docstring(SOURCE, (1, 4), formatter="reST")
+
+    def test_latest_request_wins(self):
+        generator = AsyncDocstringGenerator()
+        release = threading.Event()
+
+        async def requests():
+            # keep the only worker busy while the requests queue up
+            busy = asyncio.get_event_loop().run_in_executor(generator._executor, release.wait)
+            tasks = [
+                asyncio.ensure_future(generator.generate_docstring(
+                    SOURCE.replace("p1", name), (1, 4), buffer_id="buffer"))
+                for name in ("a", "b", "c")
+            ]
+            tasks.append(asyncio.ensure_future(
+                generator.generate_docstring(SOURCE, (1, 4), buffer_id="other")))
+            await asyncio.sleep(0)
+            release.set()
+            await busy
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            results = asyncio.run(requests())
+        finally:
+            generator.close()
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert isinstance(results[1], asyncio.CancelledError)
+        assert results[2] == generate_docstring(SOURCE.replace("p1", "c"), (1, 4))
+        assert results[3] == generate_docstring(SOURCE, (1, 4))
+        assert "buffer" not in generator.cache or \
+            generator.cache.get_source("buffer") == SOURCE.replace("p1", "c")
+        assert generator._pending == {}
+        assert generator._latest == {}
+
+    def test_concurrent_requests_for_same_buffer(self):
+        generator = AsyncDocstringGenerator(max_workers=2)
+        first_source = "x = 1\n\ndef f(a): ...\n"
+        second_source = "x = 1\ny = 2\n\ndef f(a): ...\n"
+        formatting = threading.Event()
+        reparsed = threading.Event()
+        format_scope = scopes.format_scope
+        parse_lines = generator.cache.parse_lines
+
+        def slow_format_scope(scope, formatter):
+            if not formatting.is_set():
+                # the first request formats only once the second has re-parsed the buffer
+                formatting.set()
+                reparsed.wait(5)
+            return format_scope(scope, formatter)
+
+        def signalling_parse_lines(lines, buffer_id, source):
+            tree = parse_lines(lines, buffer_id, source)
+            if source == second_source:
+                reparsed.set()
+            return tree
+
+        async def requests():
+            first = asyncio.ensure_future(
+                generator.generate_docstring(first_source, (1, 0), buffer_id="buffer"))
+            await asyncio.get_event_loop().run_in_executor(None, formatting.wait, 5)
+            second = asyncio.ensure_future(
+                generator.generate_docstring(second_source, (1, 0), buffer_id="buffer"))
+            return await asyncio.gather(first, second)
+
+        try:
+            with mock.patch("pydocstring.scopes.format_scope", slow_format_scope), \
+                    mock.patch.object(generator.cache, "parse_lines", signalling_parse_lines):
+                results = asyncio.run(requests())
+        finally:
+            generator.close()
+        assert reparsed.is_set()
+        assert results == [
+            generate_docstring(first_source, (1, 0)),
+            generate_docstring(second_source, (1, 0)),
+        ]
+
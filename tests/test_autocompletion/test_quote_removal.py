@@ -0,0 +1,41 @@
+"""
+Test removing the typed quotes before parsing
+"""
+
+import unittest
+from parso.utils import split_lines
+from pydocstring import generate_docstring
+from pydocstring.autocomplete import line_offset, remove_quotes, remove_quotes_from_lines
+from pydocstring.cache import ParseCache
+
+
+class TestQuoteRemoval(unittest.TestCase):
+
+    def test_line_offset(self):
+        source = "a\r\nbb\rccc\nd"
+        assert [line_offset(source, row) for row in range(1, 6)] == [0, 3, 6, 10, 11]
+
+    def test_remove_quotes(self):
+        source = 'def f():\r\n    """\r\n    pass\r\n'
+        assert remove_quotes(source, (2, 7)) == ('def f():\r\n    \r\n    pass\r\n', (2, 4))
+
+    def test_remove_quotes_from_lines(self):
+        source = 'def f():\n    """\n    pass\n'
+        lines = split_lines(source, keepends=True)
+        assert remove_quotes_from_lines(lines, (2, 7)) == (2, 4)
+        assert lines == split_lines(remove_quotes(source, (2, 7))[0], keepends=True)
+
+    def test_remove_quotes_across_lines(self):
+        source = 'def f(): """\npass\n'
+        lines = split_lines(source, keepends=True)
+        assert remove_quotes_from_lines(lines, (2, 1)) == (2, -2)
+        assert lines == ["def f(): \"\"ass\n", ""]
+
+    def test_cached_autocomplete(self):
+        cache = ParseCache()
+        source = 'def method(p1):\n    """\n    return p1\n'
+        for _ in range(2):
+            assert generate_docstring(
+                source, (2, 7), autocomplete=True, buffer_id="a", cache=cache) == \
+                generate_docstring(source, (2, 7), autocomplete=True)
+        assert cache.get_source("a") == source
@@ -0,0 +1,45 @@
+"""
+Test generating docstrings for every scope in a module
+"""
+
+import unittest
+from pydocstring import generate_all_docstrings, generate_docstring
+
+
+class TestGenerateAllDocstrings(unittest.TestCase):
+
+    def test_all_scopes(self):
+        source = \
+            """
+CONSTANT = 1
+
+class Class(object):
+    attr = 'a'
+
+    def method(self, p1):
+        def inner():
+            return 2
+        return p1
+
+def function(*args):
+    raise ValueError()
+"""
+        results = generate_all_docstrings(source, formatter="numpy")
+        assert [(r.scope_type, r.name) for r in results] == [
+            ("file_input", None),
+            ("classdef", "Class"),
+            ("funcdef", "method"),
+            ("funcdef", "inner"),
+            ("funcdef", "function"),
+        ]
+        assert results[1].start_pos == (4, 0)
+        assert results[3].start_pos == (8, 8)
+        assert results[4].end_pos == (14, 0)
+        for result in results:
+            assert result.docstring == generate_docstring(
+                source, position=result.start_pos, formatter="numpy")
+
+    def test_empty_module(self):
+        results = generate_all_docstrings("")
+        assert len(results) == 1
+        assert results[0].docstring == "\n\nEmpty Module\n\n"
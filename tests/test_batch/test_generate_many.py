@@ -0,0 +1,35 @@
+"""
+Test generating docstrings for many positions in the same source
+"""
+
+import unittest
+from unittest import mock
+from pydocstring import generate_docstring, generate_docstrings, scopes
+
+SOURCE = \
+    """
+CONSTANT = 1
+
+def first(p1):
+    return p1
+
+class Class(object):
+    attr = 'a'
+"""
+
+
+class TestGenerateDocstrings(unittest.TestCase):
+
+    def test_results_in_input_order(self):
+        positions = [(7, 3), (4, 3), (1, 0), (5, 6), (8, 4)]
+        docstrings = generate_docstrings(SOURCE, positions, formatter="numpy")
+        assert docstrings == [
+            generate_docstring(SOURCE, position, formatter="numpy") for position in positions
+        ]
+
+    def test_scope_rendered_once(self):
+        with mock.patch.object(
+                scopes, "format_scope", wraps=scopes.format_scope) as format_scope:
+            docstrings = generate_docstrings(SOURCE, [(4, 3), (5, 4), (4, 6), (2, 2)])
+        assert format_scope.call_count == 2
+        assert docstrings[0] == docstrings[1] == docstrings[2]
@@ -0,0 +1,75 @@
+"""
+Test streaming batch results as newline delimited JSON
+"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pydocstring import generate_all_docstrings
+from pydocstring.batch import FileResult, run_batch, write_ndjson
+from pydocstring.scopes import ScopeDocstring
+
+
+class FlushCountingStream(io.StringIO):
+
+    def __init__(self):
+        super(FlushCountingStream, self).__init__()
+        self.flushed = []
+
+    def flush(self):
+        self.flushed.append(self.getvalue())
+
+
+class TestWriteNdjson(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "a.py")
+        self.source = "def a(p1):\n    return p1\n"
+        with open(self.path, "w") as source_file:
+            source_file.write(self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_records(self):
+        stream = io.StringIO()
+        assert write_ndjson(run_batch([self.path], "numpy", workers=1), stream) == 0
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        expected = generate_all_docstrings(self.source, "numpy")
+        assert len(records) == len(expected)
+        for record, docstring in zip(records, expected):
+            assert record["file"] == self.path
+            assert tuple(record["start"]) == docstring.start_pos
+            assert tuple(record["end"]) == docstring.end_pos
+            assert record["scope_type"] == docstring.scope_type
+            assert record["name"] == docstring.name
+            assert record["docstring"] == docstring.docstring
+            assert record["seconds"] >= 0
+
+    def test_error_record(self):
+        missing = os.path.join(self.directory, "missing.py")
+        stream = io.StringIO()
+        assert write_ndjson(run_batch([missing, self.path], workers=1), stream) == 1
+        first = json.loads(stream.getvalue().splitlines()[0])
+        assert first["file"] == missing
+        assert "FileNotFoundError" in first["error"]
+
+    def test_flushed_per_file(self):
+        docstring = ScopeDocstring("file_input", None, (1, 0), (2, 0), "\n\nEmpty Module\n\n")
+        stream = FlushCountingStream()
+        requested = []
+
+        def results():
+            for path in ("a.py", "b.py"):
+                requested.append(stream.getvalue())
+                yield FileResult(path, [docstring], None, 0.0)
+
+        write_ndjson(results(), stream)
+        # each file is flushed before the next result is asked for
+        assert len(stream.flushed) == 2
+        assert requested[1] == stream.flushed[0]
+        assert stream.flushed[0].count("\n") == 1
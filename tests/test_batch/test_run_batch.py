@@ -0,0 +1,58 @@
+"""
+Test directory wide docstring generation
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pydocstring import generate_all_docstrings
+from pydocstring.batch import iter_python_files, run_batch
+
+
+class TestRunBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.sources = {}
+        for name in ("a.py", os.path.join("pkg", "b.py"), os.path.join("pkg", "c.py")):
+            path = os.path.join(self.directory, name)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            source = "def {0}(p1):\n    return p1\n".format(name[-4])
+            with open(path, "w") as source_file:
+                source_file.write(source)
+            self.sources[path] = source
+        for ignored in (".hidden", "__pycache__"):
+            os.makedirs(os.path.join(self.directory, ignored))
+            with open(os.path.join(self.directory, ignored, "d.py"), "w") as source_file:
+                source_file.write("")
+        with open(os.path.join(self.directory, "notes.txt"), "w") as notes:
+            notes.write("")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_iter_python_files(self):
+        assert sorted(iter_python_files([self.directory])) == sorted(self.sources)
+
+    def test_in_process(self):
+        results = list(run_batch([self.directory], formatter="reST", workers=1))
+        assert sorted(result.path for result in results) == sorted(self.sources)
+        for result in results:
+            assert result.error is None
+            assert result.docstrings == generate_all_docstrings(
+                self.sources[result.path], formatter="reST")
+
+    def test_process_pool(self):
+        results = list(run_batch([self.directory], workers=2, chunksize=1))
+        assert sorted(result.path for result in results) == sorted(self.sources)
+        for result in results:
+            assert result.docstrings == generate_all_docstrings(self.sources[result.path])
+
+    def test_unreadable_file_reported(self):
+        missing = os.path.join(self.directory, "missing.py")
+        results = list(run_batch([missing], workers=1))
+        assert results[0].path == missing
+        assert results[0].docstrings == []
+        assert "FileNotFoundError" in results[0].error
@@ -0,0 +1,97 @@
+"""
+Test filtering scopes as the tree is walked
+"""
+
+import sys
+import unittest
+from unittest import mock
+import parso
+import pytest
+from pydocstring import generate_all_docstrings
+from pydocstring.backends import iter_ast_scopes, iter_source_scopes
+from pydocstring.rewrite import insert_docstrings
+from pydocstring.scopes import ScopeFilter, iter_scopes
+
+SOURCE = \
+    """\"\"\"Module\"\"\"
+
+def function():
+    def nested():
+        pass
+
+def _private():
+    pass
+
+class Class(object):
+    \"\"\"Documented\"\"\"
+
+    def __init__(self):
+        pass
+
+    def _helper(self):
+        pass
+
+    def test_method(self):
+        \"\"\"Documented\"\"\"
+
+class _Private(object):
+    def method(self):
+        pass
+"""
+
+
+def names(scopes):
+    return [scope.name for scope in scopes]
+
+
+class TestScopeFilter(unittest.TestCase):
+
+    def parso_names(self, scope_filter):
+        tree = parso.parse(SOURCE)
+        return [
+            scope.name.value if scope.type != "file_input" else None
+            for scope in iter_scopes(tree, scope_filter)
+        ]
+
+    def test_undocumented(self):
+        scope_filter = ScopeFilter(undocumented=True)
+        assert self.parso_names(scope_filter) == \
+            ["function", "nested", "_private", "__init__", "_helper", "_Private", "method"]
+
+    def test_public(self):
+        assert self.parso_names(ScopeFilter(public=True)) == \
+            [None, "function", "Class", "__init__", "test_method"]
+
+    def test_names(self):
+        assert self.parso_names(ScopeFilter(names=["test_*", "_Private.*"])) == \
+            ["test_method", "method"]
+        assert self.parso_names(ScopeFilter(names=["Class"])) == ["Class"]
+
+    def test_combined(self):
+        scope_filter = ScopeFilter(undocumented=True, public=True, names=["*i*"])
+        assert self.parso_names(scope_filter) == ["function", "__init__"]
+
+    @pytest.mark.skipif(sys.version_info < (3, 8), reason="Requires Python 3.8")
+    def test_same_from_ast(self):
+        for scope_filter in (
+            ScopeFilter(undocumented=True),
+            ScopeFilter(public=True),
+            ScopeFilter(undocumented=True, public=True, names=["*i*", "Class"]),
+        ):
+            assert names(iter_ast_scopes(SOURCE, scope_filter)) == \
+                self.parso_names(scope_filter)
+
+    def test_filtered_scopes_not_read(self):
+        with mock.patch("pydocstring.backends.AstScope") as ast_scope, \
+                mock.patch("pydocstring.backends.ParsoScope") as parso_scope:
+            list(iter_source_scopes(SOURCE, scope_filter=ScopeFilter(names=["function"])))
+        assert ast_scope.call_count + parso_scope.call_count == 1
+
+    def test_generate_all_docstrings(self):
+        docstrings = generate_all_docstrings(SOURCE, scope_filter=ScopeFilter(undocumented=True))
+        assert [docstring.name for docstring in docstrings] == \
+            ["function", "nested", "_private", "__init__", "_helper", "_Private", "method"]
+
+    def test_insert_public(self):
+        result = insert_docstrings(SOURCE, public=True)
+        assert result.count('"""') == SOURCE.count('"""') + 4  # function and __init__
@@ -0,0 +1,60 @@
+"""
+Test the scope interval index finds the same scopes as a tree search
+"""
+
+import unittest
+import parso
+from pydocstring.scopes import ScopeIndex, find_scope
+
+SOURCE = '''\
+# comment
+import os
+
+@decorator
+def function(p1,
+             p2):
+    """doc"""
+    x = 1
+
+    def inner():
+        return (
+            1)
+    # trailing comment
+
+class Class(object):
+    attr = 1
+    async def method(self): pass
+    class Nested:
+        def deep(self):
+            pass
+
+
+
+def broken(:
+    pass
+x = lambda: 1
+'''
+
+
+class TestScopeIndex(unittest.TestCase):
+
+    def test_matches_find_scope(self):
+        tree = parso.parse(SOURCE)
+        index = ScopeIndex(tree)
+        assert len(index) == 6
+        lines = SOURCE.splitlines()
+        for row in range(0, len(lines) + 3):
+            width = len(lines[row - 1]) if 0 < row <= len(lines) else 0
+            for column in range(-1, width + 3):
+                position = (row, column)
+                assert index.find(position) is find_scope(tree, position), position
+
+    def test_empty_module(self):
+        tree = parso.parse("")
+        assert ScopeIndex(tree).find((1, 0)) is tree
+
+    def test_find_all_matches_find_scope(self):
+        tree = parso.parse(SOURCE)
+        positions = [(row, column) for row in range(30, -1, -1) for column in (8, 0, 30)]
+        scopes = ScopeIndex(tree).find_all(positions)
+        assert scopes == [find_scope(tree, position) for position in positions]
@@ -0,0 +1,37 @@
+"""
+Test the benchmark cases exercise what they claim to
+"""
+
+import unittest
+from benchmarks import runner
+from benchmarks.synthetic import POSITIONS, cursor_case, generate_module
+from pydocstring import generate_docstring
+
+
+class TestBenchmarkCases(unittest.TestCase):
+
+    def test_cursor_cases_document_a_function(self):
+        source, def_rows = generate_module(200)
+        assert 190 <= source.count("\n") <= 230
+        for position in POSITIONS:
+            plain = generate_docstring(*cursor_case(source, def_rows, position, False))
+            completed_source, cursor = cursor_case(source, def_rows, position, True)
+            completed = generate_docstring(completed_source, cursor, autocomplete=True)
+            assert "Args:" in plain
+            assert "Raises:" in plain
+            assert completed == plain
+
+    def test_run_and_compare(self):
+        results = runner.run(sizes=(20,), formatters=("reST",), repeat=2)
+        assert len(results["results"]) == len(POSITIONS) * 2
+        for result in results["results"]:
+            assert result["p50"] <= result["p95"] <= result["p99"]
+            assert result["peak_memory"] > 0
+        comparison = runner.compare(results, results)
+        assert [ratio for _, ratio, _ in comparison] == [1.0] * len(comparison)
+
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        assert runner.percentile(samples, 50) == 50
+        assert runner.percentile(samples, 99) == 99
+        assert runner.percentile([3], 95) == 3
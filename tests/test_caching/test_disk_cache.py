@@ -0,0 +1,158 @@
+"""
+Test the persistent docstring cache
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pydocstring import FORMATTER, generate_docstring
+from pydocstring.batch import process_file, run_batch
+from pydocstring.diskcache import DiskCache
+from pydocstring.formatter import get_formatter
+from pydocstring.scopes import ScopeFilter
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "cache", "docstrings.db")
+        self.cache = DiskCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_get_set(self):
+        key = DiskCache.key("google", "x = 1\n")
+        assert self.cache.get(key) is None
+        self.cache.set(key, ["docstring"])
+        assert self.cache.get(key) == ["docstring"]
+        assert len(self.cache) == 1
+
+    def test_key_depends_on_every_part(self):
+        key = DiskCache.key("google", "x = 1\n", [1, 0])
+        assert key == DiskCache.key("google", "x = 1\n", [1, 0])
+        assert key != DiskCache.key("numpy", "x = 1\n", [1, 0])
+        assert key != DiskCache.key("google", "x = 2\n", [1, 0])
+        assert key != DiskCache.key("google", "x = 1\n", [1, 1])
+
+    def test_shared_between_connections(self):
+        self.cache.set("key", "value")
+        other = DiskCache(self.path)
+        try:
+            assert other.get("key") == "value"
+        finally:
+            other.close()
+
+    @mock.patch("pydocstring.diskcache._TOUCH_INTERVAL", 0)
+    def test_evicts_least_recently_used(self):
+        self.cache.max_bytes = 20
+        self.cache.set("a", "a" * 8)
+        self.cache.set("b", "b" * 8)
+        self.cache.get("a")
+        self.cache.set("c", "c" * 8)
+        self.cache.evict()
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") == "a" * 8
+        assert self.cache.get("c") == "c" * 8
+
+    def test_short_lived_caches_evict(self):
+        source = "def method(p1):\n    return p1\n"
+        for index in range(60):
+            cache = DiskCache(self.path, max_bytes=200)
+            try:
+                generate_docstring(source.replace("p1", "p{0}".format(index)), disk_cache=cache)
+            finally:
+                cache.close()
+        total = self.cache._connection.execute(
+            "SELECT SUM(size), (SELECT total FROM docstrings_size) FROM docstrings"
+        ).fetchone()
+        assert total[0] <= 200
+        assert total[0] == total[1]
+
+    def test_running_total(self):
+        self.cache.set("a", "a" * 8)
+        self.cache.set("a", "a" * 4)
+        self.cache.set("b", "b" * 8)
+        assert self.cache._total() == 16
+        # a database written before the running total existed is counted when opened
+        self.cache._connection.execute("DROP TABLE docstrings_size")
+        other = DiskCache(self.path)
+        try:
+            assert other._total() == 16
+        finally:
+            other.close()
+
+    def test_recent_hit_not_written(self):
+        self.cache.set("a", "a")
+        accessed = self.cache._connection.execute("SELECT accessed FROM docstrings").fetchone()
+        with mock.patch("pydocstring.diskcache.time.time", return_value=accessed[0] + 60):
+            assert self.cache.get("a") == "a"
+        assert self.cache._connection.execute(
+            "SELECT accessed FROM docstrings"
+        ).fetchone() == accessed
+
+    def test_generate_docstring_reuses_result(self):
+        source = "def method(p1):\n    return p1\n"
+        docstring = generate_docstring(source, position=(1, 5), disk_cache=self.cache)
+        with mock.patch("pydocstring.scopes.format_scope") as format_scope:
+            assert generate_docstring(source, position=(1, 5), disk_cache=self.cache) == docstring
+            format_scope.assert_not_called()
+        assert generate_docstring(
+            source, position=(1, 5), formatter="numpy", disk_cache=self.cache
+        ) == generate_docstring(source, position=(1, 5), formatter="numpy")
+
+    def test_formatter_fingerprint(self):
+        assert get_formatter("google").fingerprint != get_formatter("numpy").fingerprint
+        assert get_formatter("google").fingerprint == get_formatter(
+            dict(FORMATTER["google"])
+        ).fingerprint
+
+    def test_batch_reuses_unchanged_files(self):
+        source_path = os.path.join(self.directory, "a.py")
+        with open(source_path, "w") as source_file:
+            source_file.write("def a(p1):\n    return p1\n")
+        first = process_file(source_path, disk_cache=self.cache).docstrings
+        with mock.patch("pydocstring.batch.iter_source_scopes") as iter_scopes:
+            assert process_file(source_path, disk_cache=self.cache).docstrings == first
+            iter_scopes.assert_not_called()
+
+        with open(source_path, "w") as source_file:
+            source_file.write("def a(p1, p2):\n    return p1\n")
+        changed = process_file(source_path, disk_cache=self.cache).docstrings
+        assert changed != first
+        assert changed == process_file(source_path).docstrings
+
+    def test_run_batch_with_cache_path(self):
+        source_path = os.path.join(self.directory, "a.py")
+        with open(source_path, "w") as source_file:
+            source_file.write("def a(p1):\n    return p1\n")
+        first = list(run_batch([source_path], workers=1, cache_path=self.path))
+        second = list(run_batch([source_path], workers=1, cache_path=self.path))
+        assert [result[:3] for result in second] == [result[:3] for result in first]
+        assert len(self.cache) == 1
+
+    def test_batch_shares_scopes_between_formatters(self):
+        source_path = os.path.join(self.directory, "a.py")
+        with open(source_path, "w") as source_file:
+            source_file.write("def a(p1):\n    return p1\n")
+        process_file(source_path, disk_cache=self.cache)
+        with mock.patch("pydocstring.batch.iter_source_scopes") as iter_scopes:
+            numpy = process_file(source_path, "numpy", disk_cache=self.cache)
+            iter_scopes.assert_not_called()
+        assert numpy.docstrings == process_file(source_path, "numpy").docstrings
+
+    def test_batch_keys_on_scope_filter(self):
+        source_path = os.path.join(self.directory, "a.py")
+        with open(source_path, "w") as source_file:
+            source_file.write('def a(p1):\n    """Documented"""\n    return p1\n')
+        everything = process_file(source_path, disk_cache=self.cache)
+        undocumented = process_file(
+            source_path, disk_cache=self.cache, scope_filter=ScopeFilter(undocumented=True)
+        )
+        assert len(everything.docstrings) == 2
+        assert [docstring.scope_type for docstring in undocumented.docstrings] == ["file_input"]
+        assert len(self.cache) == 2
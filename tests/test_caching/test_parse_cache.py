@@ -0,0 +1,77 @@
+"""
+Test the buffer parse cache
+"""
+
+import unittest
+from pydocstring import generate_docstring
+from pydocstring.cache import ParseCache
+
+
+class TestParseCache(unittest.TestCase):
+
+    def test_reparse_matches_full_parse(self):
+        cache = ParseCache()
+        source = \
+            """
+def method(p1):
+    return p1
+"""
+        edited = \
+            """
+def method(p1, p2=2):
+    return p1
+"""
+        generate_docstring(source, position=(2, 2), buffer_id="buf", cache=cache)
+        docstring = generate_docstring(
+            edited, position=(2, 2), buffer_id="buf", cache=cache)
+        assert docstring == generate_docstring(edited, position=(2, 2))
+        assert cache.get_source("buf") == edited
+
+    def test_module_reused_for_same_source(self):
+        cache = ParseCache()
+        first = cache.parse("x = 1\n", "buf")
+        assert cache.parse("x = 1\n", "buf") is first
+
+    def test_evict_by_buffer_count(self):
+        cache = ParseCache(max_buffers=2)
+        cache.parse("a = 1\n", "a")
+        cache.parse("b = 1\n", "b")
+        cache.parse("a = 2\n", "a")
+        cache.parse("c = 1\n", "c")
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+
+    def test_evict_by_size(self):
+        cache = ParseCache(max_bytes=20)
+        cache.parse("a = 1\n", "a")
+        cache.parse("b = 1\n", "b")
+        cache.parse("c = 'long string'\n", "c")
+        assert "a" not in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.total_bytes == len("c = 'long string'\n")
+
+    def test_invalidate(self):
+        cache = ParseCache()
+        cache.parse("a = 1\n", "a")
+        cache.invalidate("a")
+        assert "a" not in cache
+        assert cache.total_bytes == 0
+
+    def test_scope_index_built_for_repeated_queries(self):
+        cache = ParseCache()
+        source = "def first(a):\n    pass\n\ndef second(b):\n    pass\n"
+        tree = cache.parse(source, "buf")
+        assert cache.find_scope("buf", tree, (1, 4)).name.value == "first"
+        assert cache._entries["buf"].scope_index is None
+        assert cache.find_scope("buf", tree, (4, 4)).name.value == "second"
+        assert cache._entries["buf"].scope_index is not None
+
+        edited = "def first(a):\n    pass\n\ndef renamed(b):\n    pass\n"
+        tree = cache.parse(edited, "buf")
+        assert cache._entries["buf"].scope_index is None
+        assert generate_docstring(edited, (4, 4), buffer_id="buf", cache=cache) == \
+            generate_docstring(edited, (4, 4))
+        assert cache.find_scope("buf", tree, (4, 4)).name.value == "renamed"
@@ -0,0 +1,130 @@
+"""
+Run the google, numpy and reST formatting tests against the ast backend as well as parso
+"""
+
+import sys
+import unittest
+from unittest import mock
+import parso
+import pytest
+import test_google_formatting
+import test_numpy_formatting
+import test_reST_formatting
+from pydocstring import generate_all_docstrings, generate_docstring
+from pydocstring.backends import ParsoScope, iter_ast_scopes, iter_source_scopes
+from pydocstring.formatter import get_formatter
+from pydocstring.scopes import find_scope, format_scope, iter_scopes
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 8), reason="Requires Python 3.8")
+
+
+def generate_with_ast(source, position=(1, 0), formatter="google"):
+    """
+    Generate a docstring from the scope information read by the ast backend
+
+    Source that doesn't compile goes to parso, as it does in batch mode.
+    """
+    try:
+        scopes = list(iter_ast_scopes(source))
+    except SyntaxError:
+        return generate_docstring(source, position, formatter)
+    node = find_scope(parso.parse(source), position)
+    scope = next(
+        scope for scope in scopes if (scope.type, scope.start_pos) == (node.type, node.start_pos)
+    )
+    return format_scope(scope, get_formatter(formatter))
+
+
+def ast_backend(test_case):
+    """
+    Subclass a formatting test case to generate its docstrings through the ast backend
+    """
+    module = sys.modules[test_case.__module__]
+
+    def setUp(self):
+        patcher = mock.patch.object(module, "generate_docstring", generate_with_ast)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    return type(test_case.__name__ + "Ast", (test_case,), {"setUp": setUp})
+
+
+TestGoogleFunctionFormattingAst = ast_backend(test_google_formatting.TestGoogleFunctionFormatting)
+TestGoogleClassFormattingAst = ast_backend(test_google_formatting.TestGoogleClassFormatting)
+TestGoogleModuleFormattingAst = ast_backend(test_google_formatting.TestGoogleModuleFormatting)
+TestNumpyFunctionFormattingAst = ast_backend(test_numpy_formatting.TestNumpyFunctionFormatting)
+TestNumpyClassFormattingAst = ast_backend(test_numpy_formatting.TestNumpyClassFormatting)
+TestNumpyModuleFormattingAst = ast_backend(test_numpy_formatting.TestNumpyModuleFormatting)
+TestreSTFunctionFormattingAst = ast_backend(test_reST_formatting.TestreSTFunctionFormatting)
+TestreSTClassFormattingAst = ast_backend(test_reST_formatting.TestreSTClassFormatting)
+TestreSTModuleFormattingAst = ast_backend(test_reST_formatting.TestreSTModuleFormatting)
+
+
+SOURCE = \
+    """#!/usr/bin/env python
+CONSTANT = (1)
+
+@decorator
+async  def coroutine(p1: int, p2 = 2, *, p3=(1,
+                                           2), **kwargs):
+    try:
+        result = await p1
+    except ValueError:
+        raise errors.Invalid("p1")
+    else:
+        return (result +
+                p2)  # comment
+    finally:
+        def nested():
+            return 1
+        yield  p3
+
+class Class(Base,
+            metaclass=Meta):
+    attr: int = 1
+    other = attr = 'é'
+    attr += 1
+
+    class Inline: value = 1
+"""
+
+
+class TestBackendParity(unittest.TestCase):
+
+    def test_scopes(self):
+        parso_scopes = [ParsoScope(scope) for scope in iter_scopes(parso.parse(SOURCE))]
+        ast_scopes = list(iter_ast_scopes(SOURCE))
+        assert [(s.type, s.name, s.start_pos, s.end_pos) for s in ast_scopes] == \
+            [(s.type, s.name, s.start_pos, s.end_pos) for s in parso_scopes]
+        assert [(s.has_docstring(), s.body_start()) for s in ast_scopes] == \
+            [(s.has_docstring(), s.body_start()) for s in parso_scopes]
+        for formatter in ("google", "numpy", "reST"):
+            formatter = get_formatter(formatter)
+            for ast_scope, parso_scope in zip(ast_scopes, parso_scopes):
+                assert format_scope(ast_scope, formatter) == format_scope(parso_scope, formatter)
+
+    def test_bare_keywords(self):
+        cases = [
+            ("def f():\n    return\n", ([("TYPE", "")], [], [])),
+            ("def f() -> int:\n    yield\n", ([], [("int", "")], [])),
+            ("def f():\n    try:\n        pass\n    except Error:\n        raise\n", ([], [], [])),
+        ]
+        for source, flow_statements in cases:
+            parso_scope = ParsoScope(find_scope(parso.parse(source), (1, 0)))
+            ast_scope = list(iter_ast_scopes(source))[1]
+            assert parso_scope.flow_statements() == flow_statements
+            assert ast_scope.flow_statements() == flow_statements
+            for formatter in ("google", "numpy", "reST"):
+                formatter = get_formatter(formatter)
+                assert format_scope(ast_scope, formatter) == format_scope(parso_scope, formatter)
+
+    def test_falls_back_to_parso(self):
+        broken = "def method(p1):\n    return p1 +\n"
+        scopes = list(iter_source_scopes(broken))
+        assert [type(scope) for scope in scopes] == [ParsoScope, ParsoScope]
+        assert [type(scope).__name__ for scope in iter_source_scopes(SOURCE)][:1] == ["AstScope"]
+
+    def test_generate_all_docstrings(self):
+        docstrings = generate_all_docstrings(SOURCE, "numpy")
+        assert [docstring.name for docstring in docstrings] == \
+            [None, "coroutine", "nested", "Class", "Inline"]
@@ -0,0 +1,75 @@
+"""
+Test compiled and custom formatters
+"""
+
+import unittest
+import pytest
+from pydocstring import FORMATTER, Formatter, generate_docstring, register_formatter
+from pydocstring.exc import InvalidFormatterError
+
+
+class TestFormatter(unittest.TestCase):
+
+    def test_unknown_formatter_name(self):
+        with pytest.raises(InvalidFormatterError):
+            generate_docstring("def method():\n    pass\n", formatter="unknown")
+
+    def test_missing_template(self):
+        definition = dict(FORMATTER["google"])
+        del definition["raise_placeholder"]
+        with pytest.raises(InvalidFormatterError) as error:
+            Formatter(definition, "broken")
+        assert "raise_placeholder" in str(error.value)
+
+    def test_unknown_field(self):
+        definition = dict(FORMATTER["google"], raise_placeholder="{1}\n")
+        with pytest.raises(InvalidFormatterError):
+            Formatter(definition, "broken")
+
+    def test_malformed_template(self):
+        definition = dict(FORMATTER["google"], param_placeholder="{0\n")
+        with pytest.raises(InvalidFormatterError):
+            Formatter(definition, "broken")
+
+    def test_compiled_templates(self):
+        formatter = Formatter(FORMATTER["reST"], "reST")
+        assert formatter.start_args_block == "\n\n"
+        assert formatter.param_placeholder("p", "int", "%d") == \
+            ":param p: %d\n:type p: int\n"
+        assert formatter.return_annotation_placeholder("int") == ":return: \n:rtype: int\n"
+
+    def test_register_custom_formatter(self):
+        definition = dict(
+            FORMATTER["google"],
+            start_args_block="\n\nArguments:\n",
+            param_placeholder="    {0!s:>4} -- {1}{2}\n",
+        )
+        register_formatter("custom", definition)
+        docstring = generate_docstring(
+            "def method(a, b=1):\n    pass\n", formatter="custom")
+        assert docstring == """
+
+
+Arguments:
+       a -- TYPE
+       b -- int default: ``1``
+
+"""
+
+    def test_formatter_dict_entries(self):
+        source = "def method(a):\n    pass\n"
+        generate_docstring(source)
+        FORMATTER["mine"] = dict(FORMATTER["google"], start_args_block="\n\nArguments:\n")
+        google = FORMATTER["google"]
+        try:
+            assert "Arguments:" in generate_docstring(source, formatter="mine")
+            FORMATTER["mine"] = dict(FORMATTER["mine"], start_args_block="\n\nParams:\n")
+            assert "Params:" in generate_docstring(source, formatter="mine")
+            FORMATTER["google"] = dict(google, start_args_block="\n\nArgs!\n")
+            assert "Args!" in generate_docstring(source)
+        finally:
+            del FORMATTER["mine"]
+            FORMATTER["google"] = google
+        assert "Args:" in generate_docstring(source)
+        with pytest.raises(InvalidFormatterError):
+            generate_docstring(source, formatter="mine")
@@ -0,0 +1,42 @@
+"""
+Test rendering one scope in several styles
+"""
+
+import unittest
+from unittest import mock
+import parso
+from pydocstring import DocstringSession, generate_docstring, generate_docstring_styles
+from pydocstring.exc import InvalidFormatterError
+
+SOURCE = \
+    """def method(p1, p2=2):
+    \"\"\"
+    if p1:
+        raise ValueError()
+    return p2
+"""
+
+
+class TestDocstringStyles(unittest.TestCase):
+
+    def test_matches_each_style(self):
+        docstrings = generate_docstring_styles(SOURCE, (2, 7), autocomplete=True)
+        assert list(docstrings) == ["google", "numpy", "reST"]
+        for style, docstring in docstrings.items():
+            assert docstring == generate_docstring(SOURCE, (2, 7), style, autocomplete=True)
+
+    def test_parses_once(self):
+        with mock.patch("parso.parse", wraps=parso.parse) as parse:
+            generate_docstring_styles(SOURCE, (1, 0), ["numpy", "reST"])
+        assert parse.call_count == 1
+
+    def test_session(self):
+        session = DocstringSession(SOURCE)
+        docstrings = session.generate_docstring_styles((2, 7), ["reST"], autocomplete=True)
+        assert docstrings == {
+            "reST": generate_docstring(SOURCE, (2, 7), "reST", autocomplete=True)
+        }
+
+    def test_unknown_style(self):
+        with self.assertRaises(InvalidFormatterError):
+            generate_docstring_styles(SOURCE, (1, 0), ["google", "unknown"])
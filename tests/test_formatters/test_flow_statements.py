@@ -0,0 +1,43 @@
+"""
+Test the single pass collection of return, yield and raise statements
+"""
+
+import unittest
+import parso
+from pydocstring.format_utils import get_flow_statements
+
+
+class TestFlowStatements(unittest.TestCase):
+
+    def test_matches_parso_iterators(self):
+        source = \
+            """
+def method(p1=lambda: (yield)):
+    if p1:
+        return
+    for x in p1:
+        try:
+            yield x
+        except ValueError:
+            raise
+        finally:
+            y = yield from x
+    while True:
+        with p1 as p:
+            raise KeyError(p)
+    def inner():
+        yield 1
+        return 2
+    class Inner:
+        raise TypeError()
+    value = [(yield i) for i in p1]
+    return (yield value), lambda: (yield)
+"""
+        function = next(parso.parse(source).iter_funcdefs())
+        returns, yields, raises = get_flow_statements(function)
+        assert returns == list(function.iter_return_stmts())
+        assert yields == list(function.iter_yield_exprs())
+        assert raises == list(function.iter_raise_stmts())
+        assert len(returns) == 2
+        assert len(yields) == 4
+        assert len(raises) == 2
@@ -0,0 +1,68 @@
+"""
+Test the intermediate representation docstrings are rendered from
+"""
+
+import json
+import sys
+import unittest
+import parso
+import pytest
+from pydocstring import generate_docstring
+from pydocstring.backends import iter_ast_scopes
+from pydocstring.ir import Attribute, Param, Raise, Return, extract_scope, load_scope
+from pydocstring.scopes import format_scope, iter_scopes
+
+SOURCE = \
+    """CONSTANT = 1
+
+def function(p1: int, p2=2, *args, **kwargs) -> str:
+    if p1:
+        raise ValueError("p1")
+    yield p2
+    return str(p1)
+
+class Class(object):
+    attr = "value"
+"""
+
+
+class TestScopeInfo(unittest.TestCase):
+
+    def setUp(self):
+        self.scopes = [extract_scope(scope) for scope in iter_scopes(parso.parse(SOURCE))]
+
+    def test_extract(self):
+        module, function, cls = self.scopes
+        assert module.attributes == [Attribute("CONSTANT", "int", "1")]
+        assert function.name == "function"
+        assert function.params == [
+            Param(0, "p1", "int", ""),
+            Param(0, "p2", "int", " default: ``2``"),
+            Param(1, "args", None, None),
+            Param(2, "kwargs", None, None),
+        ]
+        assert function.return_annotation == "str"
+        assert function.returns == [Return("str", "str(p1)")]
+        assert function.yields == [Return("str", "p2")]
+        assert function.raises == [Raise("ValueError")]
+        assert function.attributes == []
+        assert (cls.type, cls.start_pos, cls.end_pos) == ("classdef", (9, 0), (11, 0))
+        assert cls.attributes == [Attribute("attr", "str", '"value"')]
+
+    def test_renders_like_the_tree(self):
+        positions = [(1, 0), (3, 4), (9, 4)]
+        for formatter in ("google", "numpy", "reST"):
+            for scope, position in zip(self.scopes, positions):
+                assert format_scope(scope, formatter) == \
+                    generate_docstring(SOURCE, position, formatter)
+
+    def test_json_round_trip(self):
+        for scope in self.scopes:
+            assert load_scope(json.loads(json.dumps(scope))) == scope
+
+    def test_passes_scope_info_through(self):
+        assert extract_scope(self.scopes[1]) is self.scopes[1]
+
+    @pytest.mark.skipif(sys.version_info < (3, 8), reason="Requires Python 3.8")
+    def test_same_from_ast(self):
+        assert [extract_scope(scope) for scope in iter_ast_scopes(SOURCE)] == self.scopes
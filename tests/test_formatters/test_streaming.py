@@ -0,0 +1,23 @@
+"""
+Test writing docstrings to a stream
+"""
+
+import io
+import unittest
+import parso
+from pydocstring import FORMATTER, generate_docstring
+from pydocstring.formatter import write_module_docstring
+
+
+class TestWriteModuleDocstring(unittest.TestCase):
+
+    def test_matches_generated_docstring(self):
+        source = "".join("CONST_{0} = {0}\n".format(i) for i in range(100))
+        stream = io.StringIO()
+        write_module_docstring(parso.parse(source), FORMATTER["numpy"], stream)
+        assert stream.getvalue() == generate_docstring(source, formatter="numpy")
+
+    def test_empty_module(self):
+        stream = io.StringIO()
+        write_module_docstring(parso.parse("import os\n"), FORMATTER["google"], stream)
+        assert stream.getvalue() == "\n\nEmpty Module\n\n"
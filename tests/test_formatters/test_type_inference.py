@@ -0,0 +1,46 @@
+"""
+Test inferring the type of literal values
+"""
+
+import unittest
+from pydocstring import format_utils
+from pydocstring.format_utils import safe_determine_type
+
+
+class TestSafeDetermineType(unittest.TestCase):
+
+    def test_simple_literals(self):
+        for literal, expected in [
+                ("1", "int"), ("-1", "int"), ("1_000", "int"), ("0x1f", "int"),
+                ("1.5", "float"), (".5", "float"), ("1e5", "float"), ("1j", "complex"),
+                ("None", "NoneType"), ("True", "bool"), ("'a'", "str"), ('r"\\d"', "str"),
+                ("b'a'", "bytes"), ("'a' 'b'", "str"), ("[]", "list"), ("()", "tuple"),
+                ("{}", "dict"), ("{1, 2}", "set"), ("set([1])", "set"), ("(1,)", "tuple")]:
+            assert safe_determine_type(literal) == expected, literal
+
+    def test_not_literals(self):
+        for code in ["foo()", "x", "'a' + 'b'", "f'{x}'", "[x for x in y]", "{1: x}", "01"]:
+            assert safe_determine_type(code) == "TYPE", code
+
+    def test_evaluated_types_are_remembered(self):
+        format_utils._literal_type.cache_clear()
+        safe_determine_type("[1, 2, 3]")
+        safe_determine_type("[1, 2, 3]")
+        info = format_utils._literal_type.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_large_literals_typed_by_brackets(self):
+        items = range(format_utils.LITERAL_EVAL_SIZE_LIMIT)
+        format_utils._literal_type.cache_clear()
+        assert safe_determine_type(repr(list(items))) == "list"
+        assert safe_determine_type(repr(tuple(items))) == "tuple"
+        assert safe_determine_type(repr(set(items))) == "set"
+        assert safe_determine_type(repr({i: "a:b" for i in items})) == "dict"
+        assert safe_determine_type(repr(list(items)) + " * 2") == "TYPE"
+        # parentheses without a top level comma aren't a tuple
+        assert safe_determine_type("(" + " ".join(repr(chr(i)) for i in items) + ")") == "TYPE"
+        assert safe_determine_type("(1 + " + "1" * len(items) + ")") == "TYPE"
+        # escaped quotes don't end a string
+        assert safe_determine_type(repr({"'\"": 1, **{i: i for i in items}})) == "dict"
+        assert format_utils._literal_type.cache_info().misses == 0
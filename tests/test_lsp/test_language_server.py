@@ -0,0 +1,175 @@
+"""
+Test the language server
+"""
+
+import io
+import unittest
+from pydocstring import generate_docstring
+from pydocstring.lsp import LanguageServer, read_message, write_message
+
+URI = "file:///module.py"
+
+SOURCE = \
+    """def method(p1, p2=2):
+    return p2
+
+class Class(object):
+    attr = 1
+"""
+
+
+def encode(*messages):
+    stream = io.BytesIO()
+    for message in messages:
+        write_message(stream, message)
+    return stream.getvalue()
+
+
+def decode(data):
+    stream = io.BytesIO(data)
+    messages = []
+    while True:
+        message = read_message(stream)
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+def request(request_id, method, params=None):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+
+
+def notification(method, params=None):
+    return {"jsonrpc": "2.0", "method": method, "params": params}
+
+
+def change(start, end, text):
+    return {
+        "range": {
+            "start": {"line": start[0], "character": start[1]},
+            "end": {"line": end[0], "character": end[1]},
+        },
+        "text": text,
+    }
+
+
+class TestLanguageServer(unittest.TestCase):
+
+    def setUp(self):
+        self.outfile = io.BytesIO()
+        self.server = LanguageServer(io.BytesIO(), self.outfile)
+        self.server.handle(notification(
+            "textDocument/didOpen",
+            {"textDocument": {"uri": URI, "languageId": "python", "version": 1, "text": SOURCE}},
+        ))
+
+    def call(self, method, params):
+        self.server.handle(request(1, method, params))
+        response = decode(self.outfile.getvalue())[-1]
+        assert "error" not in response, response
+        return response["result"]
+
+    def edit(self, *changes):
+        self.server.handle(notification(
+            "textDocument/didChange",
+            {"textDocument": {"uri": URI, "version": 2}, "contentChanges": list(changes)},
+        ))
+
+    def test_session(self):
+        data = encode(
+            request(1, "initialize", {"initializationOptions": {"formatter": "numpy"}}),
+            notification("initialized", {}),
+            request(2, "unknown/method", {}),
+            request(3, "shutdown"),
+            notification("exit"),
+        )
+        outfile = io.BytesIO()
+        assert LanguageServer(io.BytesIO(data), outfile).serve() == 0
+        responses = decode(outfile.getvalue())
+        assert [response["id"] for response in responses] == [1, 2, 3]
+        capabilities = responses[0]["result"]["capabilities"]
+        assert capabilities["textDocumentSync"]["change"] == 2
+        assert responses[1]["error"]["code"] == -32601
+        assert responses[2]["result"] is None
+
+    def test_exit_without_shutdown(self):
+        data = encode(notification("exit"))
+        assert LanguageServer(io.BytesIO(data), io.BytesIO()).serve() == 1
+
+    def test_incremental_changes(self):
+        self.edit(change((0, 19), (0, 19), ", p3"), change((1, 11), (1, 13), "p3"))
+        expected = SOURCE.replace("p2=2", "p2=2, p3").replace("return p2", "return p3")
+        assert self.server.documents[URI].source == expected
+        self.edit({"text": "x = 1\n"})
+        assert self.server.documents[URI].source == "x = 1\n"
+
+    def test_completion(self):
+        self.edit(change((1, 0), (1, 0), '    """\n'))
+        items = self.call("textDocument/completion", {
+            "textDocument": {"uri": URI}, "position": {"line": 1, "character": 7},
+        })
+        docstring = generate_docstring(SOURCE, (1, 0))
+        text_edit = items[0]["textEdit"]
+        assert text_edit["range"]["start"] == {"line": 1, "character": 7}
+        lines = text_edit["newText"].split("\n")
+        assert lines[-1] == '    """'
+        assert "\n".join(line[4:] for line in lines[:-1]) + "\n" == docstring
+
+    def test_completion_replaces_closing_quotes(self):
+        source = "def f(a, b=1):\n    if a:\n        raise ValueError()\n    return b\n"
+        self.edit({"text": source.replace("\n", '\n    """"""\n', 1)})
+        items = self.call("textDocument/completion", {
+            "textDocument": {"uri": URI}, "position": {"line": 1, "character": 7},
+        })
+        assert items[0]["textEdit"]["range"]["end"] == {"line": 1, "character": 10}
+        docstring = generate_docstring(source, (1, 0))
+        assert "Raises:" in docstring
+        lines = docstring.split("\n")
+        expected = "\n".join(lines[:1] + ["    " + line if line else line for line in lines[1:]])
+        assert items[0]["textEdit"]["newText"] == expected + '    """'
+
+    def test_no_completion_without_quotes(self):
+        items = self.call("textDocument/completion", {
+            "textDocument": {"uri": URI}, "position": {"line": 1, "character": 4},
+        })
+        assert items == []
+
+    def test_code_action(self):
+        actions = self.call("textDocument/codeAction", {
+            "textDocument": {"uri": URI},
+            "range": {"start": {"line": 4, "character": 4}, "end": {"line": 4, "character": 4}},
+            "context": {"diagnostics": []},
+        })
+        text_edit = actions[0]["edit"]["changes"][URI][0]
+        assert text_edit["range"]["start"] == {"line": 4, "character": 0}
+        assert text_edit["newText"].startswith('    """\n\n\n    Attributes:\n')
+        assert text_edit["newText"].endswith('\n    """\n')
+
+    def test_no_code_action_with_docstring(self):
+        self.edit(change((1, 0), (1, 0), '    """Documented"""\n'))
+        actions = self.call("textDocument/codeAction", {
+            "textDocument": {"uri": URI},
+            "range": {"start": {"line": 0, "character": 4}, "end": {"line": 0, "character": 4}},
+            "context": {"diagnostics": []},
+        })
+        assert actions == []
+
+    def test_utf16_positions(self):
+        self.edit({"text": "x = '\U0001f600'; y = 1\n"})
+        self.edit(change((0, 8), (0, 9), ""))
+        assert self.server.documents[URI].source == "x = '\U0001f600' y = 1\n"
+
+    def test_error_response(self):
+        self.server.handle(request(1, "textDocument/completion", {
+            "textDocument": {"uri": "file:///unknown.py"}, "position": {"line": 0, "character": 0},
+        }))
+        response = decode(self.outfile.getvalue())[-1]
+        assert response["id"] == 1
+        assert response["error"]["code"] == -32603
+
+    def test_read_message(self):
+        stream = io.BytesIO(
+            b'Content-Length: 16\r\nContent-Type: application/json\r\n\r\n{"method": "\xc3\xa9"}'
+        )
+        assert read_message(stream) == {"method": "é"}
+        assert read_message(stream) is None
@@ -0,0 +1,139 @@
+"""
+Test inserting docstrings in place
+"""
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from unittest import mock
+from pydocstring import generate_docstring
+from pydocstring.backends import iter_ast_scopes
+from pydocstring.rewrite import docstring_insertion, insert_docstrings, write_docstrings
+
+SOURCE = \
+    """import os
+
+@decorator
+def function(p1):
+    # comment
+    return p1
+
+class Class(object):
+    \"\"\"Documented\"\"\"
+
+    def inline(self): return 1
+
+    def method(self):
+        pass
+"""
+
+
+class TestInsertDocstrings(unittest.TestCase):
+
+    def test_insert(self):
+        expected = (
+            "import os\n"
+            "\n"
+            "@decorator\n"
+            "def function(p1):\n"
+            "    # comment\n"
+            '    """\n\n\n    Args:\n        p1 (TYPE): \n\n\n    Returns:\n        TYPE: p1\n\n'
+            '    """\n'
+            "    return p1\n"
+            "\n"
+            "class Class(object):\n"
+            '    """Documented"""\n'
+            "\n"
+            "    def inline(self): return 1\n"
+            "\n"
+            "    def method(self):\n"
+            '        """\n\n\n        Args:\n            self (TYPE): \n\n        """\n'
+            "        pass\n"
+        )
+        assert insert_docstrings(SOURCE) == expected
+
+    def test_matches_generated_docstrings(self):
+        result = insert_docstrings(SOURCE, "reST")
+        assert '    """{0}    """\n'.format(
+            generate_docstring(SOURCE, (4, 4), "reST").replace("\n:", "\n    :")
+        ) in result
+
+    def test_numpy_indentation(self):
+        result = insert_docstrings("X = 1\n\ndef f(a):\n    return a\n", "numpy")
+        assert result == (
+            '"""\n\n\nAttributes\n----------\nX : int\n    1\n\n"""\n'
+            "X = 1\n"
+            "\n"
+            "def f(a):\n"
+            '    """\n\n\n    Parameters\n    ----------\n    a : TYPE\n\n\n\n'
+            '    Returns\n    -------\n    TYPE\n        a\n\n    """\n'
+            "    return a\n"
+        )
+
+    def test_numpy_indentation_nested(self):
+        result = insert_docstrings("class A:\n    def f(self, a=1):\n        pass\n", "numpy")
+        assert "\n        Parameters\n        ----------\n        self : TYPE\n" in result
+        assert "\n        a : int\n             default: ``1``\n" in result
+
+    def test_skips_module_without_attributes(self):
+        source = "import os\n\ndef f():\n    pass\n"
+        assert insert_docstrings(source) == source.replace(
+            "    pass", '    """\n\n    """\n    pass'
+        )
+
+    def test_parses_once(self):
+        with mock.patch("pydocstring.rewrite.iter_ast_scopes", wraps=iter_ast_scopes) as parse:
+            insert_docstrings(SOURCE)
+        assert parse.call_count == 1
+
+    def test_nothing_to_insert(self):
+        source = '"""Module"""\ndef function(): return 1\n'
+        assert insert_docstrings(source) is source
+
+    def test_keeps_line_endings(self):
+        result = insert_docstrings('"""Module"""\r\ndef function():\r\n    pass\r\n')
+        assert result == \
+            '"""Module"""\r\ndef function():\r\n    """\r\n\r\n    """\r\n    pass\r\n'
+
+    def test_does_not_compile(self):
+        with self.assertRaises(SyntaxError):
+            insert_docstrings("def function(:\n    pass\n")
+
+    def test_quoting(self):
+        assert docstring_insertion("\nx\n", "  ") == '  """\n  x\n  """\n'
+        assert docstring_insertion('\n"""\\n\n', "") == "r'''\n\"\"\"\\n\n'''\n"
+        assert docstring_insertion("\n\"\"\" '''\n", "") is None
+
+
+class TestWriteDocstrings(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "module.py")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write(self):
+        source = "# -*- coding: latin-1 -*-\nCONSTANT = 'é'\n"
+        with open(self.path, "wb") as source_file:
+            source_file.write(source.encode("latin-1"))
+        os.chmod(self.path, 0o751)
+        assert write_docstrings(self.path)
+        with open(self.path, "rb") as source_file:
+            assert source_file.read().decode("latin-1") == insert_docstrings(source)
+        assert stat.S_IMODE(os.stat(self.path).st_mode) == 0o751
+        assert os.listdir(self.directory) == ["module.py"]
+        assert not write_docstrings(self.path)
+
+    def test_failed_write_leaves_file(self):
+        with open(self.path, "w") as source_file:
+            source_file.write("x = 1\n")
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_docstrings(self.path)
+        with open(self.path) as source_file:
+            assert source_file.read() == "x = 1\n"
+        assert os.listdir(self.directory) == ["module.py"]
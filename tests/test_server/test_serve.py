@@ -0,0 +1,55 @@
+"""
+Test the newline delimited JSON server
+"""
+
+import io
+import json
+import unittest
+from pydocstring import generate_docstring
+from pydocstring.server import serve
+
+
+class TestServe(unittest.TestCase):
+
+    def run_requests(self, *requests):
+        infile = io.StringIO("\n".join(json.dumps(r) for r in requests) + "\n")
+        outfile = io.StringIO()
+        serve(infile, outfile)
+        return [json.loads(line) for line in outfile.getvalue().splitlines()]
+
+    def test_docstring_response(self):
+        source = "def method(p1):\n    pass\n"
+        responses = self.run_requests(
+            {"id": 1, "source": source, "position": [1, 4], "formatter": "numpy"})
+        assert responses == [{
+            "id": 1,
+            "docstring": generate_docstring(source, (1, 4), formatter="numpy"),
+        }]
+
+    def test_buffer_id_reuses_source(self):
+        source = "def method(p1):\n    pass\n"
+        responses = self.run_requests(
+            {"id": 1, "source": source, "buffer_id": "a", "position": [1, 4]},
+            {"id": 2, "buffer_id": "a", "position": [1, 4]},
+        )
+        assert responses[0]["docstring"] == responses[1]["docstring"]
+
+    def test_errors_are_reported(self):
+        infile = io.StringIO('not json\n{"id": 3, "buffer_id": "missing"}\n')
+        outfile = io.StringIO()
+        serve(infile, outfile)
+        responses = [json.loads(line) for line in outfile.getvalue().splitlines()]
+        assert responses[0]["id"] is None
+        assert "error" in responses[0]
+        assert responses[1]["id"] == 3
+        assert "missing" in responses[1]["error"]
+
+    def test_timing(self):
+        responses = self.run_requests(
+            {"source": "def method(p1):\n    pass\n", "position": [1, 4], "timing": True},
+            {"source": "x = 1\n"},
+        )
+        timing = responses[0]["timing"]
+        assert timing["scope_type"] == "funcdef"
+        assert timing["source_size"] == 25
+        assert "timing" not in responses[1]
@@ -0,0 +1,77 @@
+"""
+Test editable docstring sessions
+"""
+
+import random
+import unittest
+import pytest
+from parso.utils import split_lines
+from pydocstring import DocstringSession, generate_docstring
+
+SOURCE = \
+    """
+def method(p1, p2=2):
+    if p1:
+        raise ValueError()
+    return p2
+
+class Class(object):
+    attr = 1
+"""
+
+
+class TestDocstringSession(unittest.TestCase):
+
+    def test_query(self):
+        session = DocstringSession(SOURCE)
+        assert session.generate_docstring((2, 4), formatter="numpy") == \
+            generate_docstring(SOURCE, (2, 4), formatter="numpy")
+        assert session.generate_docstring((8, 4)) == generate_docstring(SOURCE, (8, 4))
+
+    def test_edits(self):
+        session = DocstringSession(SOURCE)
+        session.generate_docstring((2, 4))
+        session.edit((2, 15), (2, 19), "p3")
+        session.edit((8, 4), (8, 8), "other")
+        session.edit((4, 8), (5, 0), "return p1\n    yield p2\n")
+        expected = SOURCE.replace("p2=2", "p3").replace("attr", "other").replace(
+            "raise ValueError()", "return p1\n    yield p2")
+        assert session.source == expected
+        assert session.lines == split_lines(expected, keepends=True)
+        for position in [(2, 4), (3, 4), (8, 4), (1, 0)]:
+            assert session.generate_docstring(position) == generate_docstring(expected, position)
+
+    def test_autocomplete_leaves_buffer(self):
+        session = DocstringSession(SOURCE)
+        session.edit((2, 21), (2, 21), '\n    """')
+        typed = session.source
+        assert session.generate_docstring((3, 7), autocomplete=True) == \
+            generate_docstring(typed, (3, 7), autocomplete=True)
+        assert session.source == typed
+        assert session.generate_docstring((3, 7)) == generate_docstring(typed, (3, 7))
+
+    def test_random_edits_match_source(self):
+        rand = random.Random(4)
+        source = SOURCE
+        session = DocstringSession(source)
+        for _ in range(200):
+            lines = split_lines(source, keepends=True)
+            start_row = rand.randint(1, len(lines))
+            end_row = rand.randint(start_row, min(start_row + 2, len(lines)))
+            start_column = rand.randint(0, len(lines[start_row - 1].rstrip("\r\n")))
+            end_column = rand.randint(0, len(lines[end_row - 1].rstrip("\r\n")))
+            if end_row == start_row:
+                end_column = max(start_column, end_column)
+            text = rand.choice(["", "x", "\n", "\r\n", "def f(a):\n    ", "  pass\r"])
+            offset = sum(len(line) for line in lines[:start_row - 1]) + start_column
+            end = sum(len(line) for line in lines[:end_row - 1]) + end_column
+            source = source[:offset] + text + source[end:]
+            session.edit((start_row, start_column), (end_row, end_column), text)
+            assert session.lines == split_lines(source, keepends=True)
+            if rand.random() < 0.2:
+                assert session.tree.get_code() == source
+
+    def test_edit_outside_buffer(self):
+        session = DocstringSession("x = 1\n")
+        with pytest.raises(ValueError):
+            session.edit((3, 0), (3, 0), "y")
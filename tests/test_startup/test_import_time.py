@@ -0,0 +1,59 @@
+"""
+Test the import time budget of the CLI
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+import pydocstring
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(pydocstring.__file__)))
+
+# Cumulative import time of ``pydocstring.cli``, in microseconds. Well above a cold import on a
+# developer machine, so that only a real regression, like importing parso up front, fails it
+IMPORT_BUDGET = 100000
+
+# Imported only once a command needs them
+DEFERRED_MODULES = ("parso", "asyncio", "sqlite3", "concurrent.futures", "pydocstring.formatter")
+
+
+def import_times(module):
+    """
+    Import the module in a fresh interpreter, returning the cumulative time of every import
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_heavy_modules_deferred(self):
+        times = import_times("pydocstring.cli")
+        for module in DEFERRED_MODULES:
+            assert module not in times, "{0} is imported at startup".format(module)
+
+    def test_import_budget(self):
+        # the best of a few runs, to ride out a busy machine
+        best = min(import_times("pydocstring.cli")["pydocstring.cli"] for _ in range(3))
+        assert best < IMPORT_BUDGET, "Importing pydocstring.cli took {0}us".format(best)
+
+    def test_lazy_attributes(self):
+        assert pydocstring.get_formatter("google").name == "google"
+        assert "DocstringSession" in dir(pydocstring)
+        assert "find_scope" not in dir(pydocstring)
+        assert pydocstring.formatter.get_formatter is pydocstring.get_formatter
+        assert "session" in dir(pydocstring)
+        with self.assertRaises(AttributeError):
+            pydocstring.not_an_attribute
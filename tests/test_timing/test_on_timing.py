@@ -0,0 +1,23 @@
+"""
+Test per-phase timing of docstring generation
+"""
+
+import unittest
+from pydocstring import generate_docstring
+
+
+class TestOnTiming(unittest.TestCase):
+
+    def test_timing_reported(self):
+        timings = []
+        source = "class Class(object):\n    \"\"\"\n    attr = 1\n"
+        docstring = generate_docstring(
+            source, position=(2, 7), autocomplete=True, on_timing=timings.append)
+        assert docstring == generate_docstring(source, position=(2, 7), autocomplete=True)
+        assert len(timings) == 1
+        timing = timings[0]
+        assert timing.scope_type == "classdef"
+        assert timing.source_size == len(source) - 3
+        for phase in (timing.splice, timing.parse, timing.scope, timing.format):
+            assert phase >= 0
+        assert timing.parse > 0
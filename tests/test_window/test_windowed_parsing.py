@@ -0,0 +1,77 @@
+"""
+Test parsing only the top level block around the cursor
+"""
+
+import unittest
+from pydocstring import generate_docstring
+from pydocstring.window import find_window
+
+SOURCE = '''\
+import os
+
+CONSTANT = 1
+
+
+def first(p1, p2=2):
+    if p1:
+        raise ValueError()
+# a comment at the start of a line
+    return p2
+
+
+class Class(object):
+    attr = [1, 2]
+
+    def method(self):
+        yield self
+
+@decorator
+def decorated(a):
+    pass
+
+TEXT = """
+def in_string(b):
+    pass
+"""
+
+def continued(a,
+b):
+    return a
+'''
+
+
+class TestWindowedParsing(unittest.TestCase):
+
+    def test_window_around_block(self):
+        window, position = find_window(SOURCE, (8, 8))
+        assert window.startswith("def first(")
+        assert window.endswith("    return p2\n\n\n")
+        assert position == (3, 8)
+        window, position = find_window(SOURCE, (17, 4))
+        assert window.startswith("class Class(")
+        assert position == (5, 4)
+
+    def test_ambiguous_blocks(self):
+        for row in (1, 3, 20, 21, 24, 25, 29, 30):
+            assert find_window(SOURCE, (row, 4)) is None, row
+        # the first triple quotes are in a single quoted string, the def is in the second string
+        source = 'x = \'"""\'\ns = """\ndef fake(a):\n    return a\n"""\n' + "y = 1\n" * 100
+        assert find_window(source, (4, 4)) is None
+        assert generate_docstring(source, (4, 4), window_threshold=0) == \
+            generate_docstring(source, (4, 4), window_threshold=None)
+
+    def test_matches_full_parse(self):
+        lines = SOURCE.splitlines()
+        for row in range(1, len(lines) + 1):
+            for column in (0, 4, 8):
+                position = (row, column)
+                assert generate_docstring(SOURCE, position, window_threshold=0) == \
+                    generate_docstring(SOURCE, position, window_threshold=None), position
+
+    def test_autocomplete(self):
+        source = SOURCE.replace("    if p1:", '    """\n    if p1:')
+        window, position = find_window(source, (7, 7), autocomplete=True)
+        assert position == (2, 4)
+        assert '"""' not in window
+        assert generate_docstring(source, (7, 7), autocomplete=True, window_threshold=0) == \
+            generate_docstring(source, (7, 7), autocomplete=True, window_threshold=None)